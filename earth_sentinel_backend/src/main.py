@@ -1,9 +1,10 @@
 import os
 import sys
+import time
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from flask import Flask, g, send_from_directory
 from flask_cors import CORS
 from src.models.user import db
 from src.models.sensor import SensorNode, SensorReading, BeneficiaryHousehold, RiskAssessment
@@ -19,6 +20,31 @@ app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 # Enable CORS for all routes
 CORS(app, origins="*")
 
+# Server-Timing headers so hot sections (DB, external HTTP) show up in
+# browser dev tools; routes append (name, seconds) pairs to g.server_timing
+@app.before_request
+def start_request_timer():
+    g.server_timing = []
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def emit_server_timing(response):
+    timings = list(getattr(g, 'server_timing', []))
+    request_start = getattr(g, 'request_start', None)
+    if request_start is not None:
+        timings.append(('app', time.perf_counter() - request_start))
+    if timings:
+        response.headers['Server-Timing'] = ', '.join(
+            f'{name};dur={duration * 1000:.1f}' for name, duration in timings
+        )
+    return response
+
+# Lightweight liveness probe: no DB, no service singletons, so clients
+# can preflight cheaply before running real requests
+@app.route('/api/health')
+def health():
+    return {'status': 'ok'}
+
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(data_bp, url_prefix='/api')
 app.register_blueprint(risk_bp, url_prefix='/api')
@@ -50,4 +76,8 @@ def serve(path):
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # threaded=True lets concurrent requests overlap their blocking I/O
+    # (the risk routes call back into this server for X-Road data).
+    # In production run under gunicorn with cooperative workers instead:
+    #   gunicorn -k gevent -w 4 src.main:app
+    app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
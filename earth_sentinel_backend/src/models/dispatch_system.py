@@ -1,5 +1,6 @@
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import json
@@ -161,6 +162,7 @@ class BeckNDiscoveryService:
     def __init__(self):
         self.resources: Dict[str, Resource] = {}
         self.service_providers: Dict[str, Dict] = {}
+        self.version = 0  # Bumped on every mutation, used for HTTP cache validation
         self.initialize_mock_resources()
     
     def initialize_mock_resources(self):
@@ -279,17 +281,19 @@ class BeckNDiscoveryService:
     def register_resource(self, resource: Resource) -> bool:
         """Register a new resource in the discovery service"""
         self.resources[resource.resource_id] = resource
+        self.version += 1
         return True
-    
+
     def update_resource_status(self, resource_id: str, status: ResourceStatus, location: Optional[Location] = None) -> bool:
         """Update resource status and location"""
         if resource_id not in self.resources:
             return False
-        
+
         self.resources[resource_id].status = status
         if location:
             self.resources[resource_id].location = location
-        
+        self.version += 1
+
         return True
 
 class DispatchFulfillmentService:
@@ -299,7 +303,9 @@ class DispatchFulfillmentService:
         self.discovery_service = discovery_service
         self.active_requests: Dict[str, DispatchRequest] = {}
         self.assignments: Dict[str, DispatchAssignment] = {}
+        self.recent_assignments: Deque[DispatchAssignment] = deque(maxlen=10)
         self.fulfillment_history: List[Dict] = []
+        self.version = 0  # Bumped on every mutation, used for HTTP cache validation
     
     def create_dispatch_request(self, request_data: Dict) -> DispatchRequest:
         """Create a new dispatch request"""
@@ -320,15 +326,30 @@ class DispatchFulfillmentService:
         )
         
         self.active_requests[request.request_id] = request
+        self.version += 1
         return request
-    
+
+    def create_and_assign(self, request_data: Dict, resource_id: Optional[str] = None) -> Tuple[DispatchRequest, Optional[DispatchAssignment]]:
+        """Create a dispatch request and assign a resource in a single operation
+
+        Avoids the extra request lookup that a separate create + assign
+        round trip would incur on every dispatch.
+        """
+        request = self.create_dispatch_request(request_data)
+        assignment = self._assign_to_request(request, resource_id)
+        return request, assignment
+
     def assign_resource(self, request_id: str, resource_id: Optional[str] = None) -> Optional[DispatchAssignment]:
         """Assign a resource to a dispatch request"""
         if request_id not in self.active_requests:
             return None
-        
+
         request = self.active_requests[request_id]
-        
+        return self._assign_to_request(request, resource_id)
+
+    def _assign_to_request(self, request: DispatchRequest, resource_id: Optional[str] = None) -> Optional[DispatchAssignment]:
+        """Assign a resource to an already-created dispatch request"""
+
         # If no specific resource requested, find the best available one
         if not resource_id:
             available_resources = self.discovery_service.discover_resources(request)
@@ -347,7 +368,7 @@ class DispatchFulfillmentService:
         # Create assignment
         assignment = DispatchAssignment(
             assignment_id=str(uuid.uuid4()),
-            request_id=request_id,
+            request_id=request.request_id,
             resource_id=resource_id,
             status=DispatchStatus.ASSIGNED,
             assigned_at=datetime.utcnow(),
@@ -368,7 +389,9 @@ class DispatchFulfillmentService:
         
         # Store assignment
         self.assignments[assignment.assignment_id] = assignment
-        
+        self.recent_assignments.append(assignment)
+        self.version += 1
+
         return assignment
     
     def _get_resource_speed(self, resource_type: ResourceType) -> float:
@@ -482,7 +505,8 @@ class DispatchFulfillmentService:
                     
                     # Make resource available again
                     self.discovery_service.update_resource_status(assignment.resource_id, ResourceStatus.AVAILABLE)
-        
+
+        self.version += 1
         return assignment
     
     def get_assignment_status(self, assignment_id: str) -> Optional[Dict]:
@@ -508,10 +532,11 @@ class DispatchFulfillmentService:
         
         assignment = self.assignments[assignment_id]
         assignment.status = DispatchStatus.CANCELLED
-        
+
         # Make resource available again
         self.discovery_service.update_resource_status(assignment.resource_id, ResourceStatus.AVAILABLE)
-        
+        self.version += 1
+
         return True
 
 # Global instances
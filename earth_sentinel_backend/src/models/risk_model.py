@@ -19,7 +19,12 @@ class FederatedRiskModel:
         }
         self.global_weights = self._initialize_global_weights()
         self.training_history = []
-    
+        # Union of every sub-model's feature needs; callers can skip the
+        # sensor fetch entirely when this is empty
+        self.required_features = set().union(
+            *(model.required_features for model in self.models.values())
+        )
+
     def _initialize_global_weights(self):
         """Initialize global model weights for federated learning"""
         return {
@@ -31,37 +36,86 @@ class FederatedRiskModel:
     
     def assess_risk(self, location, sensor_data=None):
         """Assess risk using ensemble of specialized models"""
-        lat, lon = location['lat'], location['lon']
-        
-        # Get predictions from all models
-        predictions = {}
-        for risk_type, model in self.models.items():
-            predictions[risk_type] = model.predict(lat, lon, sensor_data)
-        
-        # Find dominant risk
-        dominant_risk = max(predictions.items(), key=lambda x: x[1]['risk_score'])
-        risk_type, risk_data = dominant_risk
-        
-        # Calculate ensemble confidence
-        confidence = np.mean([pred['confidence'] for pred in predictions.values()])
-        
+        return self.assess_risk_batch([location], [sensor_data])[0]
+
+    def assess_risk_batch(self, locations, sensor_data_list=None):
+        """Assess risk for many locations in a single vectorized pass
+
+        Stacks all coordinates into NumPy arrays, scores every model over
+        the whole batch at once, and classifies the dominant risk with one
+        argmax instead of a per-location Python call chain.
+        """
+        num_locations = len(locations)
+        if num_locations == 0:
+            return []
+        if sensor_data_list is None:
+            sensor_data_list = [None] * num_locations
+
+        sensor_data_list = [self._merge_readings(sd) for sd in sensor_data_list]
+
+        lats = np.array([loc['lat'] for loc in locations], dtype=np.float64)
+        lons = np.array([loc['lon'] for loc in locations], dtype=np.float64)
+
+        # Get predictions from all models, one vectorized call per model
+        risk_types = list(self.models.keys())
+        predictions = {
+            risk_type: self.models[risk_type].predict_batch(lats, lons, sensor_data_list)
+            for risk_type in risk_types
+        }
+
+        # Find the dominant risk and ensemble confidence per location
+        score_matrix = np.array([
+            [pred['risk_score'] for pred in predictions[risk_type]]
+            for risk_type in risk_types
+        ])
+        confidence_matrix = np.array([
+            [pred['confidence'] for pred in predictions[risk_type]]
+            for risk_type in risk_types
+        ])
+        dominant_indices = np.argmax(score_matrix, axis=0)
+        confidences = confidence_matrix.mean(axis=0)
+
         # Calculate geofence radius based on risk score and type
-        base_radius = risk_data['risk_score'] * 2000  # 0-2km base
         type_multiplier = {'flood': 1.5, 'earthquake': 1.2, 'fire': 2.0, 'extreme_weather': 1.8}
-        geofence_radius = base_radius * type_multiplier.get(risk_type, 1.0)
-        
-        return {
-            'risk_score': risk_data['risk_score'],
-            'risk_type': risk_type,
-            'confidence': confidence,
-            'contributing_factors': predictions,
-            'geofence_radius': int(geofence_radius),
-            'threshold_exceeded': risk_data['risk_score'] > 0.7,
-            'recommendation': self._generate_recommendation(risk_data['risk_score'], risk_type),
-            'location': location,
-            'timestamp': datetime.now().isoformat()
-        }
+        timestamp = datetime.now().isoformat()
+
+        results = []
+        for i, location in enumerate(locations):
+            risk_type = risk_types[dominant_indices[i]]
+            risk_score = float(score_matrix[dominant_indices[i], i])
+            geofence_radius = risk_score * 2000 * type_multiplier.get(risk_type, 1.0)
+
+            results.append({
+                'risk_score': risk_score,
+                'risk_type': risk_type,
+                'confidence': float(confidences[i]),
+                'contributing_factors': {
+                    risk_type_key: predictions[risk_type_key][i]
+                    for risk_type_key in risk_types
+                },
+                'geofence_radius': int(geofence_radius),
+                'threshold_exceeded': risk_score > 0.7,
+                'recommendation': self._generate_recommendation(risk_score, risk_type),
+                'location': location,
+                'timestamp': timestamp
+            })
+
+        return results
     
+    @staticmethod
+    def _merge_readings(sensor_data):
+        """Flatten a list of sensor records into a single readings dict
+
+        The X-Road feed returns a list of sensor records, each with a
+        'readings' dict; the sub-models consume flat feature lookups.
+        """
+        if not isinstance(sensor_data, list):
+            return sensor_data
+        merged = {}
+        for record in sensor_data:
+            merged.update(record.get('readings', {}))
+        return merged or None
+
     def _generate_recommendation(self, risk_score, risk_type):
         """Generate actionable recommendations based on risk assessment"""
         if risk_score < 0.3:
@@ -75,126 +129,196 @@ class FederatedRiskModel:
 
 class FloodRiskModel:
     """Specialized model for flood risk assessment"""
-    
+
+    required_features = {'precipitation', 'water_level'}
+
     def __init__(self):
         self.weights = np.array([0.4, 0.3, 0.2, 0.1])  # precipitation, water_level, terrain, soil_moisture
     
     def predict(self, lat, lon, sensor_data=None):
-        # Simulate flood risk calculation
-        base_risk = abs(np.sin(lat) * np.cos(lon)) * 0.5
-        
+        return self.predict_batch(np.array([lat]), np.array([lon]), [sensor_data])[0]
+
+    def predict_batch(self, lats, lons, sensor_data_list=None):
+        # Simulate flood risk calculation, vectorized over all locations
+        num_locations = len(lats)
+        if sensor_data_list is None:
+            sensor_data_list = [None] * num_locations
+
+        base_risk = np.abs(np.sin(lats) * np.cos(lons)) * 0.5
+
         # Add sensor data influence if available
-        if sensor_data:
-            precipitation_factor = min(sensor_data.get('precipitation', 0) / 100.0, 1.0)
-            water_level_factor = min(sensor_data.get('water_level', 0) / 10.0, 1.0)
-            base_risk += (precipitation_factor * 0.3 + water_level_factor * 0.2)
-        
+        for i, sensor_data in enumerate(sensor_data_list):
+            if sensor_data:
+                precipitation_factor = min(sensor_data.get('precipitation', 0) / 100.0, 1.0)
+                water_level_factor = min(sensor_data.get('water_level', 0) / 10.0, 1.0)
+                base_risk[i] += precipitation_factor * 0.3 + water_level_factor * 0.2
+
         # Add random variation
-        risk_score = np.clip(base_risk + np.random.normal(0, 0.1), 0, 1)
-        confidence = np.random.uniform(0.6, 0.9)
-        
-        return {
-            'risk_score': float(risk_score),
-            'confidence': float(confidence),
-            'factors': {
-                'precipitation': float(np.random.uniform(0, 100)),
-                'water_level': float(np.random.uniform(0, 10)),
-                'terrain_slope': float(np.random.uniform(0, 45)),
-                'soil_moisture': float(np.random.uniform(0, 100))
+        risk_scores = np.clip(base_risk + np.random.normal(0, 0.1, num_locations), 0, 1)
+        confidences = np.random.uniform(0.6, 0.9, num_locations)
+        precipitation = np.random.uniform(0, 100, num_locations)
+        water_level = np.random.uniform(0, 10, num_locations)
+        terrain_slope = np.random.uniform(0, 45, num_locations)
+        soil_moisture = np.random.uniform(0, 100, num_locations)
+
+        return [
+            {
+                'risk_score': float(risk_scores[i]),
+                'confidence': float(confidences[i]),
+                'factors': {
+                    'precipitation': float(precipitation[i]),
+                    'water_level': float(water_level[i]),
+                    'terrain_slope': float(terrain_slope[i]),
+                    'soil_moisture': float(soil_moisture[i])
+                }
             }
-        }
+            for i in range(num_locations)
+        ]
 
 class EarthquakeRiskModel:
     """Specialized model for earthquake risk assessment"""
-    
+
+    required_features = {'seismic_activity'}
+
     def __init__(self):
         self.weights = np.array([0.5, 0.3, 0.2])  # seismic_activity, geological_stability, historical_data
     
     def predict(self, lat, lon, sensor_data=None):
-        # Simulate earthquake risk based on location
-        base_risk = abs(lat + lon) % 1.0 * 0.3
-        
+        return self.predict_batch(np.array([lat]), np.array([lon]), [sensor_data])[0]
+
+    def predict_batch(self, lats, lons, sensor_data_list=None):
+        # Simulate earthquake risk based on location, vectorized
+        num_locations = len(lats)
+        if sensor_data_list is None:
+            sensor_data_list = [None] * num_locations
+
+        base_risk = np.abs(lats + lons) % 1.0 * 0.3
+
         # Add seismic sensor data if available
-        if sensor_data:
-            seismic_factor = min(sensor_data.get('seismic_activity', 0) / 10.0, 1.0)
-            base_risk += seismic_factor * 0.4
-        
-        risk_score = np.clip(base_risk + np.random.normal(0, 0.05), 0, 1)
-        confidence = np.random.uniform(0.7, 0.95)
-        
-        return {
-            'risk_score': float(risk_score),
-            'confidence': float(confidence),
-            'factors': {
-                'seismic_activity': float(np.random.uniform(0, 10)),
-                'geological_stability': float(np.random.uniform(0, 100)),
-                'fault_proximity': float(np.random.uniform(0, 50)),
-                'historical_frequency': float(np.random.uniform(0, 5))
+        for i, sensor_data in enumerate(sensor_data_list):
+            if sensor_data:
+                seismic_factor = min(sensor_data.get('seismic_activity', 0) / 10.0, 1.0)
+                base_risk[i] += seismic_factor * 0.4
+
+        risk_scores = np.clip(base_risk + np.random.normal(0, 0.05, num_locations), 0, 1)
+        confidences = np.random.uniform(0.7, 0.95, num_locations)
+        seismic_activity = np.random.uniform(0, 10, num_locations)
+        geological_stability = np.random.uniform(0, 100, num_locations)
+        fault_proximity = np.random.uniform(0, 50, num_locations)
+        historical_frequency = np.random.uniform(0, 5, num_locations)
+
+        return [
+            {
+                'risk_score': float(risk_scores[i]),
+                'confidence': float(confidences[i]),
+                'factors': {
+                    'seismic_activity': float(seismic_activity[i]),
+                    'geological_stability': float(geological_stability[i]),
+                    'fault_proximity': float(fault_proximity[i]),
+                    'historical_frequency': float(historical_frequency[i])
+                }
             }
-        }
+            for i in range(num_locations)
+        ]
 
 class FireRiskModel:
     """Specialized model for fire risk assessment"""
-    
+
+    required_features = {'temperature', 'humidity', 'wind_speed'}
+
     def __init__(self):
         self.weights = np.array([0.3, 0.25, 0.25, 0.2])  # temperature, humidity, wind, vegetation
     
     def predict(self, lat, lon, sensor_data=None):
-        # Simulate fire risk calculation
-        base_risk = abs(np.tan(lat * 0.1) * np.sin(lon * 0.1)) * 0.4
-        
+        return self.predict_batch(np.array([lat]), np.array([lon]), [sensor_data])[0]
+
+    def predict_batch(self, lats, lons, sensor_data_list=None):
+        # Simulate fire risk calculation, vectorized over all locations
+        num_locations = len(lats)
+        if sensor_data_list is None:
+            sensor_data_list = [None] * num_locations
+
+        base_risk = np.abs(np.tan(lats * 0.1) * np.sin(lons * 0.1)) * 0.4
+
         # Weather factors
-        if sensor_data:
-            temp_factor = min(sensor_data.get('temperature', 20) / 50.0, 1.0)
-            humidity_factor = max(0, 1 - sensor_data.get('humidity', 50) / 100.0)
-            wind_factor = min(sensor_data.get('wind_speed', 0) / 30.0, 1.0)
-            base_risk += (temp_factor * 0.2 + humidity_factor * 0.2 + wind_factor * 0.1)
-        
-        risk_score = np.clip(base_risk + np.random.normal(0, 0.08), 0, 1)
-        confidence = np.random.uniform(0.5, 0.85)
-        
-        return {
-            'risk_score': float(risk_score),
-            'confidence': float(confidence),
-            'factors': {
-                'temperature': float(np.random.uniform(15, 45)),
-                'humidity': float(np.random.uniform(10, 90)),
-                'wind_speed': float(np.random.uniform(0, 25)),
-                'vegetation_dryness': float(np.random.uniform(0, 100)),
-                'fire_weather_index': float(np.random.uniform(0, 100))
+        for i, sensor_data in enumerate(sensor_data_list):
+            if sensor_data:
+                temp_factor = min(sensor_data.get('temperature', 20) / 50.0, 1.0)
+                humidity_factor = max(0, 1 - sensor_data.get('humidity', 50) / 100.0)
+                wind_factor = min(sensor_data.get('wind_speed', 0) / 30.0, 1.0)
+                base_risk[i] += temp_factor * 0.2 + humidity_factor * 0.2 + wind_factor * 0.1
+
+        risk_scores = np.clip(base_risk + np.random.normal(0, 0.08, num_locations), 0, 1)
+        confidences = np.random.uniform(0.5, 0.85, num_locations)
+        temperature = np.random.uniform(15, 45, num_locations)
+        humidity = np.random.uniform(10, 90, num_locations)
+        wind_speed = np.random.uniform(0, 25, num_locations)
+        vegetation_dryness = np.random.uniform(0, 100, num_locations)
+        fire_weather_index = np.random.uniform(0, 100, num_locations)
+
+        return [
+            {
+                'risk_score': float(risk_scores[i]),
+                'confidence': float(confidences[i]),
+                'factors': {
+                    'temperature': float(temperature[i]),
+                    'humidity': float(humidity[i]),
+                    'wind_speed': float(wind_speed[i]),
+                    'vegetation_dryness': float(vegetation_dryness[i]),
+                    'fire_weather_index': float(fire_weather_index[i])
+                }
             }
-        }
+            for i in range(num_locations)
+        ]
 
 class ExtremeWeatherRiskModel:
     """Specialized model for extreme weather risk assessment"""
-    
+
+    required_features = {'pressure', 'wind_speed'}
+
     def __init__(self):
         self.weights = np.array([0.25, 0.3, 0.25, 0.2])  # wind_speed, pressure, temperature_gradient, humidity
     
     def predict(self, lat, lon, sensor_data=None):
-        # Simulate extreme weather risk
-        base_risk = abs(np.cos(lat * 0.2) * np.sin(lon * 0.15)) * 0.35
-        
+        return self.predict_batch(np.array([lat]), np.array([lon]), [sensor_data])[0]
+
+    def predict_batch(self, lats, lons, sensor_data_list=None):
+        # Simulate extreme weather risk, vectorized over all locations
+        num_locations = len(lats)
+        if sensor_data_list is None:
+            sensor_data_list = [None] * num_locations
+
+        base_risk = np.abs(np.cos(lats * 0.2) * np.sin(lons * 0.15)) * 0.35
+
         # Meteorological factors
-        if sensor_data:
-            pressure_factor = abs(sensor_data.get('pressure', 1013) - 1013) / 50.0
-            wind_factor = min(sensor_data.get('wind_speed', 0) / 40.0, 1.0)
-            base_risk += (pressure_factor * 0.2 + wind_factor * 0.15)
-        
-        risk_score = np.clip(base_risk + np.random.normal(0, 0.06), 0, 1)
-        confidence = np.random.uniform(0.6, 0.9)
-        
-        return {
-            'risk_score': float(risk_score),
-            'confidence': float(confidence),
-            'factors': {
-                'wind_speed': float(np.random.uniform(0, 40)),
-                'atmospheric_pressure': float(np.random.uniform(980, 1040)),
-                'temperature_gradient': float(np.random.uniform(0, 20)),
-                'humidity': float(np.random.uniform(20, 95)),
-                'storm_probability': float(np.random.uniform(0, 100))
+        for i, sensor_data in enumerate(sensor_data_list):
+            if sensor_data:
+                pressure_factor = abs(sensor_data.get('pressure', 1013) - 1013) / 50.0
+                wind_factor = min(sensor_data.get('wind_speed', 0) / 40.0, 1.0)
+                base_risk[i] += pressure_factor * 0.2 + wind_factor * 0.15
+
+        risk_scores = np.clip(base_risk + np.random.normal(0, 0.06, num_locations), 0, 1)
+        confidences = np.random.uniform(0.6, 0.9, num_locations)
+        wind_speed = np.random.uniform(0, 40, num_locations)
+        atmospheric_pressure = np.random.uniform(980, 1040, num_locations)
+        temperature_gradient = np.random.uniform(0, 20, num_locations)
+        humidity = np.random.uniform(20, 95, num_locations)
+        storm_probability = np.random.uniform(0, 100, num_locations)
+
+        return [
+            {
+                'risk_score': float(risk_scores[i]),
+                'confidence': float(confidences[i]),
+                'factors': {
+                    'wind_speed': float(wind_speed[i]),
+                    'atmospheric_pressure': float(atmospheric_pressure[i]),
+                    'temperature_gradient': float(temperature_gradient[i]),
+                    'humidity': float(humidity[i]),
+                    'storm_probability': float(storm_probability[i])
+                }
             }
-        }
+            for i in range(num_locations)
+        ]
 
 class FederatedLearningSimulator:
     """
@@ -297,3 +421,15 @@ class FederatedLearningSimulator:
             'status': 'success'
         }
 
+
+# Process-pool scoring helpers. Each worker process builds its own model
+# once at startup so the model never has to be pickled per call.
+_worker_model = None
+
+def _init_score_worker():
+    global _worker_model
+    _worker_model = FederatedRiskModel()
+
+def score_batch_in_worker(locations, sensor_data_list):
+    """Score a chunk of locations inside a pool worker process"""
+    return _worker_model.assess_risk_batch(locations, sensor_data_list)
@@ -86,7 +86,12 @@ class BeneficiaryHousehold(db.Model):
 
 class RiskAssessment(db.Model):
     __tablename__ = 'risk_assessments'
-    
+    __table_args__ = (
+        # History and trends both order by timestamp and filter on score;
+        # the composite index serves the top-K window without a table sort
+        db.Index('ix_risk_assessments_timestamp_score', 'timestamp', 'risk_score'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     location_lat = db.Column(db.Float, nullable=False)
     location_lon = db.Column(db.Float, nullable=False)
@@ -95,8 +100,11 @@ class RiskAssessment(db.Model):
     confidence = db.Column(db.Float, nullable=False)  # 0-1 scale
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     geofence_radius = db.Column(db.Float, default=1000.0)  # meters
+    threshold_exceeded = db.Column(db.Boolean, default=False)
     data_sources = db.Column(db.Text)  # JSON string listing data sources used
-    
+    additional_data = db.Column(db.Text)  # JSON string with contributing factors and recommendation
+    polygon_json = db.Column(db.Text)  # Geofence polygon precomputed at insert time
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -109,6 +117,7 @@ class RiskAssessment(db.Model):
             'confidence': self.confidence,
             'timestamp': self.timestamp.isoformat() if self.timestamp else None,
             'geofence_radius': self.geofence_radius,
+            'threshold_exceeded': self.threshold_exceeded,
             'data_sources': json.loads(self.data_sources) if self.data_sources else []
         }
 
@@ -21,14 +21,14 @@ class PaymentStatus(Enum):
     FAILED = "failed"
     REFUNDED = "refunded"
 
-@dataclass
+@dataclass(slots=True)
 class ContractCondition:
     """Defines a condition for smart contract execution"""
     condition_type: str  # risk_threshold, time_based, manual_trigger
     parameters: Dict
     description: str
 
-@dataclass
+@dataclass(slots=True)
 class PaymentInstruction:
     """Payment instruction for beneficiaries"""
     beneficiary_id: str
@@ -42,6 +42,12 @@ class SmartContract:
     """OpenSPP-style smart contract for disaster response"""
     
     def __init__(self, contract_id: str = None):
+        # Serialization cache bookkeeping; must exist before the status
+        # setter below runs
+        self._dict_version = 0
+        self._dict_cache = None
+        self._dict_cache_version = -1
+
         self.contract_id = contract_id or str(uuid.uuid4())
         self.created_at = datetime.utcnow()
         self.status = ContractStatus.PENDING
@@ -50,15 +56,30 @@ class SmartContract:
         self.execution_history: List[Dict] = []
         self.trust_score = 1.0
         self.version = "1.0"
-        
+
+    @property
+    def status(self) -> ContractStatus:
+        return self._status
+
+    @status.setter
+    def status(self, value: ContractStatus):
+        self._status = value
+        self._touch()
+
+    def _touch(self):
+        """Mark the contract as mutated, invalidating the dict cache"""
+        self._dict_version += 1
+
     def add_condition(self, condition: ContractCondition):
         """Add a condition to the contract"""
         self.conditions.append(condition)
-        
+        self._touch()
+
     def add_payment_instruction(self, instruction: PaymentInstruction):
         """Add a payment instruction to the contract"""
         self.payment_instructions.append(instruction)
-        
+        self._touch()
+
     def evaluate_conditions(self, context: Dict) -> bool:
         """Evaluate if all conditions are met"""
         for condition in self.conditions:
@@ -147,10 +168,13 @@ class SmartContract:
             # Update contract status
             self.status = ContractStatus.TRIGGERED
             
-            # Execute payment instructions
+            # Execute payment instructions; every payment in this run
+            # shares the execution timestamp instead of re-reading the
+            # clock per result
+            execution_time_iso = execution_time.isoformat()
             payment_results = []
             for instruction in self.payment_instructions:
-                payment_result = self._execute_payment(instruction, context)
+                payment_result = self._execute_payment(instruction, context, execution_time_iso)
                 payment_results.append(payment_result)
             
             # Update status based on payment results
@@ -169,7 +193,8 @@ class SmartContract:
             }
             
             self.execution_history.append(execution_record)
-            
+            self._touch()
+
             return {
                 'execution_id': execution_id,
                 'status': 'success',
@@ -189,7 +214,8 @@ class SmartContract:
                 'status': 'error'
             }
             self.execution_history.append(error_record)
-            
+            self._touch()
+
             return {
                 'execution_id': execution_id,
                 'status': 'error',
@@ -197,17 +223,17 @@ class SmartContract:
                 'timestamp': execution_time.isoformat()
             }
     
-    def _execute_payment(self, instruction: PaymentInstruction, context: Dict) -> Dict:
+    def _execute_payment(self, instruction: PaymentInstruction, context: Dict, timestamp: str) -> Dict:
         """Execute a payment instruction"""
         payment_id = str(uuid.uuid4())
         
         # Simulate payment processing based on method
         if instruction.payment_method == "aadhaar_bridge":
-            return self._process_aadhaar_payment(instruction, payment_id)
+            return self._process_aadhaar_payment(instruction, payment_id, timestamp)
         elif instruction.payment_method == "digital_wallet":
-            return self._process_digital_wallet_payment(instruction, payment_id)
+            return self._process_digital_wallet_payment(instruction, payment_id, timestamp)
         elif instruction.payment_method == "bank_transfer":
-            return self._process_bank_transfer(instruction, payment_id)
+            return self._process_bank_transfer(instruction, payment_id, timestamp)
         else:
             return {
                 'payment_id': payment_id,
@@ -215,7 +241,7 @@ class SmartContract:
                 'reason': f'Unsupported payment method: {instruction.payment_method}'
             }
     
-    def _process_aadhaar_payment(self, instruction: PaymentInstruction, payment_id: str) -> Dict:
+    def _process_aadhaar_payment(self, instruction: PaymentInstruction, payment_id: str, timestamp: str) -> Dict:
         """Simulate Aadhaar Payment Bridge processing"""
         # Simulate API call to Aadhaar Payment Bridge
         import random
@@ -234,7 +260,7 @@ class SmartContract:
                 'currency': instruction.currency,
                 'transaction_id': f"AADHAAR_{uuid.uuid4().hex[:8].upper()}",
                 'processing_time': processing_time,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': timestamp
             }
         else:
             return {
@@ -243,10 +269,10 @@ class SmartContract:
                 'method': 'aadhaar_bridge',
                 'beneficiary_id': instruction.beneficiary_id,
                 'reason': 'Aadhaar verification failed',
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': timestamp
             }
     
-    def _process_digital_wallet_payment(self, instruction: PaymentInstruction, payment_id: str) -> Dict:
+    def _process_digital_wallet_payment(self, instruction: PaymentInstruction, payment_id: str, timestamp: str) -> Dict:
         """Simulate digital wallet payment processing"""
         import random
         
@@ -263,7 +289,7 @@ class SmartContract:
                 'currency': instruction.currency,
                 'transaction_id': f"WALLET_{uuid.uuid4().hex[:8].upper()}",
                 'processing_time': processing_time,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': timestamp
             }
         else:
             return {
@@ -272,10 +298,10 @@ class SmartContract:
                 'method': 'digital_wallet',
                 'beneficiary_id': instruction.beneficiary_id,
                 'reason': 'Insufficient wallet balance',
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': timestamp
             }
     
-    def _process_bank_transfer(self, instruction: PaymentInstruction, payment_id: str) -> Dict:
+    def _process_bank_transfer(self, instruction: PaymentInstruction, payment_id: str, timestamp: str) -> Dict:
         """Simulate bank transfer processing"""
         import random
         
@@ -292,7 +318,7 @@ class SmartContract:
                 'currency': instruction.currency,
                 'transaction_id': f"BANK_{uuid.uuid4().hex[:8].upper()}",
                 'processing_time': processing_time,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': timestamp
             }
         else:
             return {
@@ -301,7 +327,7 @@ class SmartContract:
                 'method': 'bank_transfer',
                 'beneficiary_id': instruction.beneficiary_id,
                 'reason': 'Bank account not found',
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': timestamp
             }
     
     def to_dict(self) -> Dict:
@@ -332,6 +358,17 @@ class SmartContract:
             'version': self.version
         }
 
+    def to_dict_cached(self) -> Dict:
+        """to_dict() memoized until the contract next mutates
+
+        Read-heavy dashboard routes serialize the same unchanged
+        contracts repeatedly; this collapses those calls to a dict ref.
+        """
+        if self._dict_cache_version != self._dict_version:
+            self._dict_cache = self.to_dict()
+            self._dict_cache_version = self._dict_version
+        return self._dict_cache
+
 class OpenG2PIntegration:
     """Integration with OpenG2P (Government-to-Person) payment system"""
     
@@ -179,6 +179,25 @@ def get_weather_data():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@data_bp.route('/xroad/bulk', methods=['GET'])
+def get_xroad_bulk():
+    """Aggregate the three X-Road feeds into one response
+
+    Clients polling all feeds pay one round-trip and one JSON parse
+    instead of three.
+    """
+    try:
+        return jsonify({
+            'status': 'success',
+            'timestamp': datetime.utcnow().isoformat(),
+            'iot': get_iot_sensor_data().get_json(),
+            'satellite': get_satellite_imagery().get_json(),
+            'weather': get_weather_data().get_json()
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # Identity & Registry Module (MOSIP/Inji style)
 @data_bp.route('/registry/sensor-nodes', methods=['POST'])
 def register_sensor_node():
@@ -11,6 +11,15 @@ from src.models.dispatch_system import (
 
 dispatch_bp = Blueprint('dispatch', __name__)
 
+# Prebuilt value -> member lookups; plain dict indexing avoids the
+# Enum.__call__ value search on every request
+_RESOURCE_TYPES = {member.value: member for member in ResourceType}
+_RESOURCE_STATUSES = {member.value: member for member in ResourceStatus}
+
+def _dispatch_etag():
+    """Build a cache validator from the service version counters"""
+    return f'"{discovery_service.version}-{fulfillment_service.version}"'
+
 @dispatch_bp.route('/dispatch/resources/discover', methods=['POST'])
 def discover_resources():
     """Discover available resources for emergency response"""
@@ -32,7 +41,7 @@ def discover_resources():
                 lon=data['location']['lon'],
                 address=data['location'].get('address')
             ),
-            resource_type=ResourceType(data['resource_type']),
+            resource_type=_RESOURCE_TYPES[data['resource_type']],
             priority=data.get('priority', 3),
             requirements=data.get('requirements', {}),
             description=data.get('description', 'Resource discovery'),
@@ -65,7 +74,9 @@ def discover_resources():
             'resources_found': len(resources_with_distance),
             'resources': resources_with_distance
         })
-    
+
+    except KeyError as e:
+        return jsonify({'error': f'Invalid value: {e.args[0]}'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -81,12 +92,9 @@ def create_dispatch_request():
             if field not in data:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        # Create dispatch request
-        request_obj = fulfillment_service.create_dispatch_request(data)
-        
-        # Automatically try to assign a resource
-        assignment = fulfillment_service.assign_resource(request_obj.request_id)
-        
+        # Create dispatch request and automatically try to assign a resource
+        request_obj, assignment = fulfillment_service.create_and_assign(data)
+
         response = {
             'status': 'success',
             'request': request_obj.to_dict()
@@ -234,9 +242,14 @@ def cancel_assignment(assignment_id):
 def list_resources():
     """List all available resources"""
     try:
+        # Short-circuit polling clients when nothing has changed
+        etag = _dispatch_etag()
+        if request.headers.get('If-None-Match') == etag:
+            return '', 304
+
         resource_type = request.args.get('type')
         status = request.args.get('status')
-        
+
         resources = []
         for resource in discovery_service.resources.values():
             # Apply filters
@@ -247,12 +260,14 @@ def list_resources():
             
             resources.append(resource.to_dict())
         
-        return jsonify({
+        response = jsonify({
             'status': 'success',
             'count': len(resources),
             'resources': resources
         })
-    
+        response.headers['ETag'] = etag
+        return response
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -296,7 +311,7 @@ def register_resource():
         # Create new resource
         resource = Resource(
             resource_id=data.get('resource_id', str(uuid.uuid4())),
-            resource_type=ResourceType(data['resource_type']),
+            resource_type=_RESOURCE_TYPES[data['resource_type']],
             name=data['name'],
             location=Location(
                 lat=data['location']['lat'],
@@ -305,7 +320,7 @@ def register_resource():
             ),
             capabilities=data['capabilities'],
             capacity=data.get('capacity', {}),
-            status=ResourceStatus(data.get('status', 'available')),
+            status=_RESOURCE_STATUSES[data.get('status', 'available')],
             operator=data['operator'],
             contact_info=data.get('contact_info', {}),
             metadata=data.get('metadata', {})
@@ -325,7 +340,9 @@ def register_resource():
                 'status': 'failed',
                 'message': 'Failed to register resource'
             }), 400
-    
+
+    except KeyError as e:
+        return jsonify({'error': f'Invalid value: {e.args[0]}'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -338,7 +355,7 @@ def update_resource_status(resource_id):
         if 'status' not in data:
             return jsonify({'error': 'Missing required field: status'}), 400
         
-        status = ResourceStatus(data['status'])
+        status = _RESOURCE_STATUSES[data['status']]
         location = None
         
         if 'location' in data:
@@ -360,7 +377,9 @@ def update_resource_status(resource_id):
                 'status': 'failed',
                 'message': 'Resource not found'
             }), 404
-    
+
+    except KeyError as e:
+        return jsonify({'error': f'Invalid value: {e.args[0]}'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -397,6 +416,20 @@ def list_assignments():
 def get_dispatch_dashboard():
     """Get dashboard overview of dispatch system"""
     try:
+        # Progress is advanced lazily, so active assignments must be
+        # updated before the ETag comparison — otherwise a conditional
+        # poller keeps getting 304s and never observes their status
+        # transitions. Each update bumps the fulfillment version, which
+        # keeps the ETag changing while anything is in flight.
+        for assignment in list(fulfillment_service.assignments.values()):
+            if assignment.status not in [DispatchStatus.COMPLETED, DispatchStatus.CANCELLED]:
+                fulfillment_service.update_assignment_progress(assignment.assignment_id)
+
+        # Short-circuit polling clients when nothing has changed
+        etag = _dispatch_etag()
+        if request.headers.get('If-None-Match') == etag:
+            return '', 304
+
         # Count resources by type and status
         resource_stats = {}
         for resource in discovery_service.resources.values():
@@ -418,10 +451,9 @@ def get_dispatch_dashboard():
             status = assignment.status.value
             assignment_stats[status] = assignment_stats.get(status, 0) + 1
         
-        # Get recent activity
+        # Get recent activity (deque is already capped at the last 10 assignments)
         recent_assignments = []
-        for assignment in list(fulfillment_service.assignments.values())[-10:]:
-            fulfillment_service.update_assignment_progress(assignment.assignment_id)
+        for assignment in fulfillment_service.recent_assignments:
             recent_assignments.append({
                 'assignment_id': assignment.assignment_id,
                 'resource_id': assignment.resource_id,
@@ -429,7 +461,7 @@ def get_dispatch_dashboard():
                 'assigned_at': assignment.assigned_at.isoformat()
             })
         
-        return jsonify({
+        response = jsonify({
             'status': 'success',
             'dashboard': {
                 'resource_statistics': resource_stats,
@@ -442,7 +474,10 @@ def get_dispatch_dashboard():
                 'last_updated': datetime.utcnow().isoformat()
             }
         })
-    
+        # Progress updates above may have bumped the counters; re-read them
+        response.headers['ETag'] = _dispatch_etag()
+        return response
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -499,12 +534,9 @@ def simulate_emergency_dispatch():
                 'description': scenario['description']
             }
             
-            # Create request
-            request_obj = fulfillment_service.create_dispatch_request(request_data)
-            
-            # Try to assign resource
-            assignment = fulfillment_service.assign_resource(request_obj.request_id)
-            
+            # Create request and try to assign a resource in one step
+            request_obj, assignment = fulfillment_service.create_and_assign(request_data)
+
             if assignment:
                 dispatched_resources.append({
                     'request': request_obj.to_dict(),
@@ -1,26 +1,97 @@
-from flask import Blueprint, jsonify, request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from flask import Blueprint, Response, g, jsonify, request, stream_with_context
+from functools import lru_cache
+from sqlalchemy import case, func, insert
 from datetime import datetime
+import math
+import os
+import random
+import time
 import uuid
-import json
+import orjson
+import numpy as np
 import requests
+from cachetools import TTLCache
 
 from src.models.user import db
 from src.models.sensor import RiskAssessment, SensorReading, SensorNode
 from src.models.risk_model import (
-    FederatedRiskModel, 
-    FloodRiskModel, 
-    EarthquakeRiskModel, 
-    FireRiskModel, 
+    FederatedRiskModel,
+    FloodRiskModel,
+    EarthquakeRiskModel,
+    FireRiskModel,
     ExtremeWeatherRiskModel,
-    FederatedLearningSimulator
+    FederatedLearningSimulator,
+    _init_score_worker,
+    score_batch_in_worker
 )
-import requests
-import random
 
 risk_bp = Blueprint('risk', __name__)
 
-# Initialize global federated model
-federated_model = FederatedRiskModel()
+# Shared HTTP session so X-Road fetches reuse keep-alive connections
+# instead of paying a TCP handshake per call
+_http = requests.Session()
+_http.mount('http://', requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=50))
+
+# Shared pool for overlapping the blocking sensor fetches in batch assessment
+_fetch_pool = ThreadPoolExecutor(max_workers=16)
+
+# Snapshot of the full X-Road sensor list, refreshed at most every 5 seconds
+_sensor_cache = TTLCache(maxsize=1, ttl=5)
+
+@lru_cache(maxsize=1)
+def get_model():
+    """Shared federated model, built lazily on first use
+
+    Keeps import (and gunicorn worker fork) fast and costs no memory in
+    workers that never serve a risk route.
+    """
+    return FederatedRiskModel()
+
+# Process pool for large batch scoring; the GIL caps the vectorized model
+# at one core per request, so big batches are chunked across workers.
+# Created lazily so the debug reloader's watcher process never spawns it.
+_score_pool = None
+
+# Below this size the fork/IPC cost outweighs the parallelism
+_SCORE_POOL_MIN_BATCH = 32
+
+def _get_score_pool():
+    global _score_pool
+    if _score_pool is None:
+        _score_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            initializer=_init_score_worker
+        )
+    return _score_pool
+
+def _score_locations(batch_locations, sensor_data_list):
+    """Score a batch, fanning large batches out across the process pool"""
+    if len(batch_locations) < _SCORE_POOL_MIN_BATCH:
+        return get_model().assess_risk_batch(batch_locations, sensor_data_list)
+
+    # A model set with no required features passes no sensor data at
+    # all; expand it so the chunked slices stay aligned
+    if sensor_data_list is None:
+        sensor_data_list = [None] * len(batch_locations)
+
+    pool = _get_score_pool()
+    chunk_size = math.ceil(len(batch_locations) / (os.cpu_count() or 1))
+    futures = [
+        pool.submit(
+            score_batch_in_worker,
+            batch_locations[i:i + chunk_size],
+            sensor_data_list[i:i + chunk_size]
+        )
+        for i in range(0, len(batch_locations), chunk_size)
+    ]
+    return [result for future in futures for result in future.result()]
+
+def _record_timing(name, start):
+    """Append a Server-Timing section for the current request"""
+    timings = getattr(g, 'server_timing', None)
+    if timings is not None:
+        timings.append((name, time.perf_counter() - start))
 
 @risk_bp.route('/risk/assess', methods=['POST'])
 def assess_risk():
@@ -32,11 +103,16 @@ def assess_risk():
         if not location or 'lat' not in location or 'lon' not in location:
             return jsonify({'error': 'Location with lat/lon required'}), 400
         
-        # Get recent sensor data for the area
-        sensor_data = get_sensor_data_for_location(location)
+        # Get recent sensor data for the area, unless no model wants any
+        if get_model().required_features:
+            fetch_start = time.perf_counter()
+            sensor_data = get_sensor_data_for_location(location)
+            _record_timing('ext_http', fetch_start)
+        else:
+            sensor_data = None
         
         # Perform risk assessment using ensemble of models
-        assessment_result = federated_model.assess_risk(location, sensor_data)
+        assessment_result = get_model().assess_risk(location, sensor_data)
         
         # Store assessment in database
         assessment = RiskAssessment(
@@ -47,16 +123,22 @@ def assess_risk():
             confidence=assessment_result['confidence'],
             geofence_radius=assessment_result['geofence_radius'],
             threshold_exceeded=assessment_result['threshold_exceeded'],
-            additional_data=json.dumps({
+            additional_data=orjson.dumps({
                 'contributing_factors': assessment_result['contributing_factors'],
                 'recommendation': assessment_result['recommendation'],
                 'sensor_data_used': len(sensor_data) if sensor_data else 0
-            })
+            }).decode(),
+            polygon_json=orjson.dumps(_generate_geofence_polygon(
+                location['lat'], location['lon'],
+                assessment_result['geofence_radius']
+            )).decode()
         )
         
+        db_start = time.perf_counter()
         db.session.add(assessment)
         db.session.commit()
-        
+        _record_timing('db', db_start)
+
         # Add assessment_id to response
         assessment_result['assessment_id'] = assessment.id
         assessment_result['status'] = 'success'
@@ -66,28 +148,58 @@ def assess_risk():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _fetch_all_sensors():
+    """Fetch the full X-Road sensor list, memoized with a short TTL
+
+    Batch assessments for nearby locations would otherwise refetch the
+    same list once per location. Returns a (records, lats, lons)
+    snapshot with the coordinates preloaded into NumPy arrays so the
+    nearby filter can run vectorized.
+    """
+    try:
+        return _sensor_cache['sensors']
+    except KeyError:
+        pass
+
+    response = _http.get('http://localhost:5000/api/xroad/iot-sensors', timeout=5)
+    if response.status_code != 200:
+        return None
+
+    sensors = [s for s in response.json().get('sensors', []) if 'location' in s]
+    snapshot = (
+        sensors,
+        np.array([s['location']['lat'] for s in sensors], dtype=np.float64),
+        np.array([s['location']['lon'] for s in sensors], dtype=np.float64)
+    )
+    _sensor_cache['sensors'] = snapshot
+    return snapshot
+
+def _filter_nearby(snapshot, location):
+    """Filter a sensor snapshot down to those near a location"""
+    sensors, lats, lons = snapshot
+    if not sensors:
+        return []
+
+    # Simple distance approximation; roughly 10km per 0.1 degree
+    mask = (np.abs(lats - location['lat']) < 0.1) & (np.abs(lons - location['lon']) < 0.1)
+    return [sensors[i] for i in np.nonzero(mask)[0]]
+
+# Simulated sensor readings when the X-Road feed is unreachable; set
+# SIMULATE_SENSOR_DATA=0 to surface the outage as missing data instead
+_SIMULATE_SENSOR_DATA = os.environ.get('SIMULATE_SENSOR_DATA', '1') == '1'
+
 def get_sensor_data_for_location(location, radius_km=10):
     """Get sensor data within radius of location"""
     try:
-        # Simulate fetching sensor data from X-Road interface
-        response = requests.get('http://localhost:5000/api/xroad/iot-sensors', timeout=5)
-        if response.status_code == 200:
-            all_sensors = response.json().get('sensors', [])
-            
-            # Filter sensors within radius (simplified distance calculation)
-            nearby_sensors = []
-            for sensor in all_sensors:
-                if 'location' in sensor:
-                    # Simple distance approximation
-                    lat_diff = abs(sensor['location']['lat'] - location['lat'])
-                    lon_diff = abs(sensor['location']['lon'] - location['lon'])
-                    if lat_diff < 0.1 and lon_diff < 0.1:  # Roughly 10km
-                        nearby_sensors.append(sensor)
-            
-            return nearby_sensors
-    except:
+        all_sensors = _fetch_all_sensors()
+        if all_sensors is not None:
+            return _filter_nearby(all_sensors, location)
+    except requests.RequestException:
         pass
-    
+
+    if not _SIMULATE_SENSOR_DATA:
+        return []
+
     # Return simulated data if API call fails
     return [
         {
@@ -113,35 +225,87 @@ def batch_assess_risk():
         if not locations:
             return jsonify({'error': 'Locations array required'}), 400
         
+        valid_locations = [
+            location for location in locations
+            if 'lat' in location and 'lon' in location
+        ]
+
+        # Deduplicate locations that round to the same ~100m cell so
+        # duplicates share one fetch, one model score, and one row
+        location_keys = []
+        unique_locations = {}
+        for location in valid_locations:
+            key = (round(location['lat'], 3), round(location['lon'], 3))
+            location_keys.append(key)
+            unique_locations.setdefault(key, location)
+
+        batch_locations = list(unique_locations.values())
+
+        # Pass 1: warm the shared sensor snapshot once, then resolve all
+        # locations concurrently against the cached list. Skipped outright
+        # when no model declares a sensor feature need.
+        if get_model().required_features:
+            fetch_start = time.perf_counter()
+            try:
+                _fetch_all_sensors()
+            except requests.RequestException:
+                pass
+            sensor_data_list = list(_fetch_pool.map(get_sensor_data_for_location, batch_locations))
+            _record_timing('ext_http', fetch_start)
+        else:
+            sensor_data_list = None
+
+        # Pass 2: score the whole batch in one vectorized model call,
+        # then build the rows
+        assessment_results = _score_locations(batch_locations, sensor_data_list)
+
+        rows = []
         results = []
-        
-        for location in locations:
-            if 'lat' not in location or 'lon' not in location:
-                continue
-                
-            sensor_data = get_sensor_data_for_location(location)
-            assessment_result = federated_model.assess_risk(location, sensor_data)
-            
+
+        for location, assessment_result in zip(batch_locations, assessment_results):
+
             # Store in database
-            assessment = RiskAssessment(
-                location_lat=location['lat'],
-                location_lon=location['lon'],
-                risk_score=assessment_result['risk_score'],
-                risk_type=assessment_result['risk_type'],
-                confidence=assessment_result['confidence'],
-                geofence_radius=assessment_result['geofence_radius'],
-                threshold_exceeded=assessment_result['threshold_exceeded'],
-                additional_data=json.dumps({
+            rows.append({
+                'location_lat': location['lat'],
+                'location_lon': location['lon'],
+                'risk_score': assessment_result['risk_score'],
+                'risk_type': assessment_result['risk_type'],
+                'confidence': assessment_result['confidence'],
+                'geofence_radius': assessment_result['geofence_radius'],
+                'threshold_exceeded': assessment_result['threshold_exceeded'],
+                'additional_data': orjson.dumps({
                     'contributing_factors': assessment_result['contributing_factors'],
                     'recommendation': assessment_result['recommendation']
-                })
-            )
-            
-            db.session.add(assessment)
-            assessment_result['assessment_id'] = assessment.id
+                }).decode(),
+                'polygon_json': orjson.dumps(_generate_geofence_polygon(
+                    location['lat'], location['lon'],
+                    assessment_result['geofence_radius']
+                )).decode()
+            })
+
             results.append(assessment_result)
-        
-        db.session.commit()
+
+        # One INSERT ... RETURNING gives back all ids in a single round
+        # trip, skipping ORM flush bookkeeping entirely. An empty
+        # parameter list would degenerate to a default-values INSERT, so
+        # skip the statement when no location had usable coordinates.
+        ids = []
+        if rows:
+            db_start = time.perf_counter()
+            ids = db.session.execute(
+                insert(RiskAssessment)
+                .returning(RiskAssessment.id, sort_by_parameter_order=True),
+                rows
+            ).scalars().all()
+            db.session.commit()
+            _record_timing('db', db_start)
+
+        for assessment_result, row_id in zip(results, ids):
+            assessment_result['assessment_id'] = row_id
+
+        # Fan the unique results back out to the original request order
+        result_by_key = dict(zip(unique_locations.keys(), results))
+        results = [result_by_key[key] for key in location_keys]
         
         return jsonify({
             'status': 'success',
@@ -185,7 +349,7 @@ def get_federated_status():
         return jsonify({
             'status': 'success',
             'model_status': {
-                'models_available': list(federated_model.models.keys()),
+                'models_available': list(get_model().models.keys()),
                 'last_training': (datetime.now() - datetime.timedelta(hours=2)).isoformat(),
                 'model_version': '1.0.0',
                 'training_nodes': 3,
@@ -196,6 +360,24 @@ def get_federated_status():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _generate_geofence_polygon(center_lat, center_lon, radius_meters, num_points=16):
+    """Generate a circular geofence polygon around a point
+
+    The trig for all points is computed in one vectorized NumPy pass
+    instead of a per-point Python loop.
+    """
+    radius_km = radius_meters / 1000.0
+    cos_lat = math.cos(math.radians(center_lat))  # Constant for the whole circle
+
+    angles = np.linspace(0, 2 * np.pi, num_points, endpoint=False)
+    lat_offsets = (radius_km / 111.0) * np.cos(angles)  # Rough km to degree conversion
+    lon_offsets = (radius_km / (111.0 * cos_lat)) * np.sin(angles)
+
+    return [
+        {'lat': center_lat + lat_off, 'lon': center_lon + lon_off}
+        for lat_off, lon_off in zip(lat_offsets.tolist(), lon_offsets.tolist())
+    ]
+
 @risk_bp.route('/risk/geofence/<int:assessment_id>', methods=['GET'])
 def get_geofence_data(assessment_id):
     """Get geofence data for a specific risk assessment"""
@@ -205,24 +387,19 @@ def get_geofence_data(assessment_id):
         if not assessment:
             return jsonify({'error': 'Assessment not found'}), 404
         
-        # Generate geofence polygon (simplified circle)
+        # Polygon is precomputed at insert time; only rows written before
+        # the column existed need the on-the-fly fallback
+        if assessment.polygon_json:
+            points = orjson.loads(assessment.polygon_json)
+        else:
+            points = _generate_geofence_polygon(
+                assessment.location_lat,
+                assessment.location_lon,
+                assessment.geofence_radius
+            )
         center_lat = assessment.location_lat
         center_lon = assessment.location_lon
-        radius_km = assessment.geofence_radius / 1000.0
-        
-        # Simple circle approximation with 16 points
-        import math
-        points = []
-        for i in range(16):
-            angle = 2 * math.pi * i / 16
-            lat_offset = radius_km * math.cos(angle) / 111.0  # Rough km to degree conversion
-            lon_offset = radius_km * math.sin(angle) / (111.0 * math.cos(math.radians(center_lat)))
-            
-            points.append({
-                'lat': center_lat + lat_offset,
-                'lon': center_lon + lon_offset
-            })
-        
+
         return jsonify({
             'status': 'success',
             'assessment_id': assessment_id,
@@ -243,38 +420,49 @@ def get_risk_history():
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
         
-        assessments = RiskAssessment.query.order_by(
-            RiskAssessment.created_at.desc()
-        ).offset(offset).limit(limit).all()
-        
-        results = []
-        for assessment in assessments:
-            additional_data = json.loads(assessment.additional_data) if assessment.additional_data else {}
-            
-            results.append({
-                'id': assessment.id,
-                'location': {
-                    'lat': assessment.location_lat,
-                    'lon': assessment.location_lon
-                },
-                'risk_score': assessment.risk_score,
-                'risk_type': assessment.risk_type,
-                'confidence': assessment.confidence,
-                'geofence_radius': assessment.geofence_radius,
-                'threshold_exceeded': assessment.threshold_exceeded,
-                'timestamp': assessment.created_at.isoformat(),
-                'contributing_factors': additional_data.get('contributing_factors', {}),
-                'recommendation': additional_data.get('recommendation', '')
-            })
-        
-        return jsonify({
-            'status': 'success',
-            'assessments': results,
-            'total_returned': len(results),
-            'offset': offset,
-            'limit': limit
-        }), 200
-        
+        # Read-only path: query just the columns we serialize so SQLAlchemy
+        # returns lightweight tuples instead of tracked ORM instances
+        rows = db.session.query(
+            RiskAssessment.id, RiskAssessment.location_lat,
+            RiskAssessment.location_lon, RiskAssessment.risk_score,
+            RiskAssessment.risk_type, RiskAssessment.confidence,
+            RiskAssessment.geofence_radius, RiskAssessment.threshold_exceeded,
+            RiskAssessment.timestamp, RiskAssessment.additional_data
+        ).order_by(
+            RiskAssessment.timestamp.desc()
+        ).offset(offset).limit(limit).yield_per(200)
+
+        # Stream the response so large limits never materialize the whole
+        # result list; yield_per keeps the DB cursor streaming in step
+        def generate():
+            yield (b'{"status":"success","offset":%d,"limit":%d,"assessments":['
+                   % (offset, limit))
+            count = 0
+            for row in rows:
+                additional_data = orjson.loads(row.additional_data) if row.additional_data else {}
+
+                if count:
+                    yield b','
+                count += 1
+                yield orjson.dumps({
+                    'id': row.id,
+                    'location': {
+                        'lat': row.location_lat,
+                        'lon': row.location_lon
+                    },
+                    'risk_score': row.risk_score,
+                    'risk_type': row.risk_type,
+                    'confidence': row.confidence,
+                    'geofence_radius': row.geofence_radius,
+                    'threshold_exceeded': row.threshold_exceeded,
+                    'timestamp': row.timestamp.isoformat(),
+                    'contributing_factors': additional_data.get('contributing_factors', {}),
+                    'recommendation': additional_data.get('recommendation', '')
+                })
+            yield b'],"total_returned":%d}' % count
+
+        return Response(stream_with_context(generate()), mimetype='application/json')
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -282,12 +470,24 @@ def get_risk_history():
 def get_risk_trends():
     """Get risk trend analysis"""
     try:
-        # Get recent assessments for trend analysis
-        recent_assessments = RiskAssessment.query.order_by(
-            RiskAssessment.created_at.desc()
-        ).limit(100).all()
-        
-        if not recent_assessments:
+        # Aggregate over the 100 most recent assessments in SQL instead of
+        # materializing full rows and re-computing the stats in Python
+        window = db.session.query(
+            RiskAssessment.risk_score.label('risk_score'),
+            RiskAssessment.risk_type.label('risk_type'),
+            RiskAssessment.location_lat.label('location_lat'),
+            RiskAssessment.location_lon.label('location_lon'),
+            RiskAssessment.timestamp.label('timestamp'),
+            func.row_number().over(
+                order_by=RiskAssessment.timestamp.desc()
+            ).label('rn')
+        ).order_by(RiskAssessment.timestamp.desc()).limit(100).subquery()
+
+        total_count, avg_risk_score = db.session.query(
+            func.count(), func.avg(window.c.risk_score)
+        ).one()
+
+        if not total_count:
             return jsonify({
                 'status': 'success',
                 'trends': {
@@ -297,54 +497,58 @@ def get_risk_trends():
                     'trend_direction': 'stable'
                 }
             }), 200
-        
-        # Calculate trends
-        total_score = sum(a.risk_score for a in recent_assessments)
-        avg_risk_score = total_score / len(recent_assessments)
-        
+
         # Risk type distribution
-        risk_types = {}
-        for assessment in recent_assessments:
-            risk_type = assessment.risk_type
-            risk_types[risk_type] = risk_types.get(risk_type, 0) + 1
-        
-        # High risk areas (score > 0.7)
-        high_risk_areas = []
-        for assessment in recent_assessments:
-            if assessment.risk_score > 0.7:
-                high_risk_areas.append({
-                    'location': {
-                        'lat': assessment.location_lat,
-                        'lon': assessment.location_lon
-                    },
-                    'risk_score': assessment.risk_score,
-                    'risk_type': assessment.risk_type,
-                    'timestamp': assessment.created_at.isoformat()
-                })
-        
-        # Simple trend direction (compare first and last half)
-        mid_point = len(recent_assessments) // 2
-        first_half_avg = sum(a.risk_score for a in recent_assessments[:mid_point]) / mid_point if mid_point > 0 else 0
-        second_half_avg = sum(a.risk_score for a in recent_assessments[mid_point:]) / (len(recent_assessments) - mid_point)
-        
+        risk_types = dict(
+            db.session.query(window.c.risk_type, func.count())
+            .group_by(window.c.risk_type).all()
+        )
+
+        # High risk areas (score > 0.7) within the same window; only
+        # these need row data
+        high_risk_areas = [
+            {
+                'location': {'lat': lat, 'lon': lon},
+                'risk_score': risk_score,
+                'risk_type': risk_type,
+                'timestamp': timestamp.isoformat()
+            }
+            for lat, lon, risk_score, risk_type, timestamp in db.session.query(
+                window.c.location_lat, window.c.location_lon,
+                window.c.risk_score, window.c.risk_type,
+                window.c.timestamp
+            ).filter(window.c.risk_score > 0.7)
+            .order_by(window.c.timestamp.desc()).limit(10).all()
+        ]
+
+        # Simple trend direction (compare first and last half of the window).
+        # The row_number label lets both half-averages come out of one scan.
+        mid_point = total_count // 2
+        first_half_avg, second_half_avg = db.session.query(
+            func.avg(case((window.c.rn <= mid_point, window.c.risk_score))),
+            func.avg(case((window.c.rn > mid_point, window.c.risk_score)))
+        ).one()
+        first_half_avg = first_half_avg or 0
+        second_half_avg = second_half_avg or 0
+
         if second_half_avg > first_half_avg + 0.05:
             trend_direction = 'increasing'
         elif second_half_avg < first_half_avg - 0.05:
             trend_direction = 'decreasing'
         else:
             trend_direction = 'stable'
-        
+
         return jsonify({
             'status': 'success',
             'trends': {
                 'average_risk_score': avg_risk_score,
                 'risk_type_distribution': risk_types,
-                'high_risk_areas': high_risk_areas[:10],  # Limit to top 10
+                'high_risk_areas': high_risk_areas,
                 'trend_direction': trend_direction,
-                'total_assessments_analyzed': len(recent_assessments)
+                'total_assessments_analyzed': total_count
             }
         }), 200
-        
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
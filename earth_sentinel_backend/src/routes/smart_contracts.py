@@ -1,6 +1,14 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import islice
+import hashlib
 import json
+import numpy as np
+import orjson
+import os
+import threading
 import uuid
 from src.models.user import db
 from src.models.sensor import BeneficiaryHousehold, RiskAssessment
@@ -11,95 +19,438 @@ from src.models.smart_contract import (
 
 contracts_bp = Blueprint('contracts', __name__)
 
+def _json_response(payload, status=200):
+    """Build a JSON response via orjson instead of Flask's stdlib json"""
+    return current_app.response_class(
+        orjson.dumps(payload), mimetype='application/json', status=status
+    )
+
+def _request_json():
+    """Parse the request body with orjson, without caching the raw bytes
+
+    cache=False releases Werkzeug's copy of the payload as soon as it is
+    parsed, so bulk creation requests hold one representation of the
+    body instead of raw bytes plus the decoded tree.
+    """
+    return orjson.loads(request.get_data(cache=False))
+
+class _BloomFilter:
+    """Compact membership filter for contract-id strings
+
+    A bytearray of bits plus k positions derived from one blake2b digest
+    per id. "Not present" answers are exact and cost a hash plus a few
+    bit probes, so lookups for ids we never stored skip the main dict
+    entirely. Ids are only ever added (the store has no deletion), so
+    the filter never goes stale.
+    """
+
+    def __init__(self, size_bits=1 << 20, num_hashes=3):
+        self._bits = bytearray(size_bits // 8)
+        self._size_bits = size_bits
+        self._num_hashes = num_hashes
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        # Double hashing: position_i = h1 + i * h2 mod m
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self._size_bits for i in range(self._num_hashes)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(key)
+        )
+
+class ContractStore:
+    """In-memory contract registry with a lock-free read path
+
+    Readers grab the current dict reference (atomic under the GIL) and
+    iterate it without blocking; writers copy-and-swap under a lock so
+    a GET that is mid-iteration keeps a stable snapshot even while a
+    POST is registering a new contract.
+    """
+
+    def __init__(self):
+        self._contracts = {}
+        self._lock = threading.Lock()
+        # Rejects lookups of unknown ids (stale polling clients) before
+        # they reach the dict
+        self._bloom = _BloomFilter()
+        # Bumped on every mutation; used as a response-cache key
+        self.version = 0
+
+    def add(self, contract):
+        with self._lock:
+            contracts = dict(self._contracts)
+            contracts[contract.contract_id] = contract
+            self._contracts = contracts
+            self._bloom.add(contract.contract_id)
+            self.version += 1
+
+    def touch(self):
+        """Record an in-place mutation of a stored contract"""
+        with self._lock:
+            self.version += 1
+
+    def get(self, contract_id):
+        if contract_id not in self._bloom:
+            return None
+        return self._contracts.get(contract_id)
+
+    def items(self):
+        return self._contracts.items()
+
+    def __len__(self):
+        return len(self._contracts)
+
 # In-memory storage for contracts (in production, use database)
-active_contracts = {}
-payment_history = []
+active_contracts = ContractStore()
+
+class PaymentLog:
+    """Append-only on-disk payment history with in-memory offset indices
+
+    Records are length-prefixed orjson frames appended to a single file;
+    RAM holds only byte offsets (a bounded recent-first deque plus a
+    per-contract index), so resident memory stays O(index) instead of
+    growing with every payment ever made. On startup the file is
+    replayed to rebuild the indices, which also survives a crash mid-run.
+    """
+
+    _PREFIX = 4  # little-endian frame length
+    RECENT_LIMIT = 10000
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT)
+        self._lock = threading.Lock()
+        self._end = 0
+        self.count = 0
+        self.recent = deque(maxlen=self.RECENT_LIMIT)
+        self.by_contract = {}
+        self._replay()
+
+    def _replay(self):
+        size = os.fstat(self._fd).st_size
+        while self._end < size:
+            header = os.pread(self._fd, self._PREFIX, self._end)
+            if len(header) < self._PREFIX:
+                break  # truncated tail from an interrupted write
+            length = int.from_bytes(header, 'little')
+            if self._end + self._PREFIX + length > size:
+                break
+            record = orjson.loads(os.pread(self._fd, length, self._end + self._PREFIX))
+            self._index(record, self._end)
+            self._end += self._PREFIX + length
+
+    def _index(self, record, offset):
+        self.count += 1
+        self.recent.append(offset)
+        self.by_contract.setdefault(record['contract_id'], deque()).append(offset)
+
+    def append(self, records):
+        """Write records as one contiguous frame batch and index them"""
+        if not records:
+            return
+        frames = []
+        for record in records:
+            blob = orjson.dumps(record)
+            frames.append(len(blob).to_bytes(self._PREFIX, 'little') + blob)
+        with self._lock:
+            offset = self._end
+            os.pwrite(self._fd, b''.join(frames), offset)
+            for record, frame in zip(records, frames):
+                self._index(record, offset)
+                offset += len(frame)
+            self._end = offset
+
+    def read(self, offset):
+        length = int.from_bytes(os.pread(self._fd, self._PREFIX, offset), 'little')
+        return orjson.loads(os.pread(self._fd, length, offset + self._PREFIX))
+
+    def snapshot(self, contract_id=None):
+        """Stable copy of an offset index for iteration outside the lock
+
+        Executor threads append concurrently, and iterating a deque that
+        mutates mid-iteration raises; readers take a cheap tuple copy
+        under the lock instead.
+        """
+        with self._lock:
+            if contract_id is None:
+                return tuple(self.recent), self.count
+            offsets = tuple(self.by_contract.get(contract_id, ()))
+            return offsets, len(offsets)
+
+payment_log = PaymentLog(os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'database', 'payment_log.bin'
+))
+
+# Guards the trigger indices, which are mutated from concurrent worker
+# threads
+_state_lock = threading.Lock()
+
+def _record_payments(records):
+    """Append history records to the on-disk log"""
+    payment_log.append(records)
+
+# Serialized list_contracts responses keyed by (status filter, store version)
+_list_cache = {}
+
+# Rolling pool of random bytes so hot simulator endpoints don't hit the
+# system entropy source (uuid4 reads /dev/urandom) per request
+_RAND_POOL_SIZE = 64 * 1024
+_rand_pool = os.urandom(_RAND_POOL_SIZE)
+_rand_index = 0
+_rand_lock = threading.Lock()
+
+def _draw(n):
+    """Take n random bytes from the shared pool, refilling when drained"""
+    global _rand_pool, _rand_index
+    with _rand_lock:
+        if _rand_index + n > _RAND_POOL_SIZE:
+            _rand_pool = os.urandom(_RAND_POOL_SIZE)
+            _rand_index = 0
+        chunk = _rand_pool[_rand_index:_rand_index + n]
+        _rand_index += n
+    return chunk
+
+class _TriggerBucket:
+    """Contracts plus a parallel threshold array for vectorized prechecks
+
+    The common condition is a plain score-vs-threshold compare, so one
+    NumPy comparison over the whole bucket prunes the candidates before
+    any per-contract Python evaluation runs.
+    """
+
+    def __init__(self):
+        self.contracts = []
+        self.thresholds = []
+        self._threshold_array = None
+
+    def add(self, contract, threshold):
+        self.contracts.append(contract)
+        self.thresholds.append(threshold)
+        self._threshold_array = None
+
+    def remove(self, contract):
+        while contract in self.contracts:
+            index = self.contracts.index(contract)
+            del self.contracts[index]
+            del self.thresholds[index]
+        self._threshold_array = None
+
+    def candidates(self, risk_score):
+        """Contracts whose threshold precheck passes the given score"""
+        if not self.contracts:
+            return []
+        if self._threshold_array is None:
+            self._threshold_array = np.array(self.thresholds, dtype=np.float64)
+        mask = self._threshold_array <= risk_score
+        return [self.contracts[i] for i in np.nonzero(mask)[0]]
+
+# Secondary trigger indices so auto-trigger only evaluates contracts that
+# watch the incoming risk type instead of scanning every contract
+contracts_by_risk_type = {}
+contracts_any_risk = _TriggerBucket()
+
+def _index_contract(contract):
+    """Register an activated contract in the trigger indices"""
+    with _state_lock:
+        typed_thresholds = {}
+        untyped_thresholds = []
+        has_risk_condition = False
+        for condition in contract.conditions:
+            if condition.condition_type == 'risk_threshold':
+                has_risk_condition = True
+                threshold = condition.parameters.get('threshold', 0.7)
+                risk_type = condition.parameters.get('risk_type')
+                if risk_type:
+                    # All conditions must hold, so the strictest
+                    # threshold per bucket is the safe precheck
+                    typed_thresholds[risk_type] = max(
+                        typed_thresholds.get(risk_type, threshold), threshold
+                    )
+                else:
+                    untyped_thresholds.append(threshold)
+
+        for risk_type, threshold in typed_thresholds.items():
+            contracts_by_risk_type.setdefault(risk_type, _TriggerBucket()).add(contract, threshold)
+        if untyped_thresholds:
+            contracts_any_risk.add(contract, max(untyped_thresholds))
+        elif not has_risk_condition:
+            # Contracts without risk conditions can still trigger on
+            # other condition types, so they bypass the precheck
+            contracts_any_risk.add(contract, float('-inf'))
+
+def deactivate(contract_id):
+    """Drop a contract from the trigger indices once it leaves ACTIVE"""
+    contract = active_contracts.get(contract_id)
+    if contract is None:
+        return
+    with _state_lock:
+        contracts_any_risk.remove(contract)
+        for bucket in contracts_by_risk_type.values():
+            bucket.remove(contract)
+
+def _build_condition(condition_data):
+    """Construct a ContractCondition from a request payload dict"""
+    return ContractCondition(
+        condition_type=condition_data['condition_type'],
+        parameters=condition_data['parameters'],
+        description=condition_data['description']
+    )
+
+def _build_instruction(payment_data):
+    """Construct a PaymentInstruction from a request payload dict"""
+    return PaymentInstruction(
+        beneficiary_id=payment_data['beneficiary_id'],
+        amount=payment_data['amount'],
+        currency=payment_data.get('currency', 'USD'),
+        payment_method=payment_data['payment_method'],
+        priority=payment_data.get('priority', 3),
+        metadata=payment_data.get('metadata', {})
+    )
+
+# Background pool for trust-layer verification when callers opt in to
+# async creation instead of blocking the request thread on it
+_verify_pool = ThreadPoolExecutor(max_workers=4)
+
+# Fan-out pool for auto-trigger: executions of distinct contracts are
+# independent of one another
+_execute_pool = ThreadPoolExecutor(max_workers=16)
+
+def _promote_or_reject(contract, verification_result):
+    """Apply an async verification outcome to a pending contract"""
+    contract.verification_result = verification_result
+    if verification_result['verified']:
+        contract.status = ContractStatus.ACTIVE
+        _index_contract(contract)
+    else:
+        contract.status = ContractStatus.FAILED
+    active_contracts.touch()
+
+def _build_contract(data):
+    """Assemble an unverified contract from a creation payload"""
+    contract = SmartContract()
+    for condition_data in data.get('conditions', []):
+        contract.add_condition(_build_condition(condition_data))
+    for payment_data in data.get('payment_instructions', []):
+        contract.add_payment_instruction(_build_instruction(payment_data))
+    return contract
+
+def _create_contract_core(data):
+    """Shared creation path: build, verify, and activate a contract
+
+    Both the create endpoint and template expansion route through this
+    single implementation. Returns (contract, verification_result); the
+    contract is registered and indexed only when verification passes.
+    """
+    contract = _build_contract(data)
+    verification_result = trust_layer.verify_contract(contract)
+
+    if verification_result['verified']:
+        contract.status = ContractStatus.ACTIVE
+        active_contracts.add(contract)
+        _index_contract(contract)
+
+    return contract, verification_result
+
+def _serialize_creation(contract, verification_result):
+    """Build the HTTP response for a contract creation attempt"""
+    if verification_result['verified']:
+        return _json_response({
+            'status': 'success',
+            'contract_id': contract.contract_id,
+            'verification': verification_result,
+            'contract': contract.to_dict_cached()
+        }, 201)
+
+    return _json_response({
+        'status': 'failed',
+        'reason': 'Contract verification failed',
+        'verification': verification_result
+    }, 400)
 
 @contracts_bp.route('/contracts/create', methods=['POST'])
 def create_smart_contract():
     """Create a new smart contract"""
     try:
-        data = request.get_json()
-        
-        # Create new contract
-        contract = SmartContract()
-        
-        # Add conditions
-        conditions_data = data.get('conditions', [])
-        for condition_data in conditions_data:
-            condition = ContractCondition(
-                condition_type=condition_data['condition_type'],
-                parameters=condition_data['parameters'],
-                description=condition_data['description']
-            )
-            contract.add_condition(condition)
-        
-        # Add payment instructions
-        payments_data = data.get('payment_instructions', [])
-        for payment_data in payments_data:
-            instruction = PaymentInstruction(
-                beneficiary_id=payment_data['beneficiary_id'],
-                amount=payment_data['amount'],
-                currency=payment_data.get('currency', 'USD'),
-                payment_method=payment_data['payment_method'],
-                priority=payment_data.get('priority', 3),
-                metadata=payment_data.get('metadata', {})
+        data = _request_json()
+
+        # Callers that don't need the verification result inline can ask
+        # for it to run in the background and poll /verification
+        if data.get('async_verification'):
+            contract = _build_contract(data)
+            active_contracts.add(contract)
+            future = _verify_pool.submit(trust_layer.verify_contract, contract)
+            future.add_done_callback(
+                lambda f: _promote_or_reject(contract, f.result())
             )
-            contract.add_payment_instruction(instruction)
-        
-        # Verify contract through trust layer
-        verification_result = trust_layer.verify_contract(contract)
-        
-        if verification_result['verified']:
-            contract.status = ContractStatus.ACTIVE
-            active_contracts[contract.contract_id] = contract
-            
-            return jsonify({
-                'status': 'success',
+            return _json_response({
+                'status': 'pending',
                 'contract_id': contract.contract_id,
-                'verification': verification_result,
-                'contract': contract.to_dict()
-            }), 201
-        else:
-            return jsonify({
-                'status': 'failed',
-                'reason': 'Contract verification failed',
-                'verification': verification_result
-            }), 400
-    
+                'verification_url': f'/api/contracts/{contract.contract_id}/verification'
+            }, 202)
+
+        contract, verification_result = _create_contract_core(data)
+        return _serialize_creation(contract, verification_result)
+
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @contracts_bp.route('/contracts/<contract_id>/execute', methods=['POST'])
 def execute_contract(contract_id):
     """Execute a smart contract"""
     try:
-        if contract_id not in active_contracts:
-            return jsonify({'error': 'Contract not found'}), 404
-        
-        contract = active_contracts[contract_id]
+        contract = active_contracts.get(contract_id)
+        if contract is None:
+            return _json_response({'error': 'Contract not found'}, 404)
+
+        # Only verified, still-active contracts may execute — the async
+        # creation path stores contracts before verification settles
+        if contract.status == ContractStatus.PENDING:
+            return _json_response(
+                {'error': 'Contract verification is still pending'}, 409
+            )
+        if contract.status != ContractStatus.ACTIVE:
+            return _json_response(
+                {'error': f'Contract is not active (status: {contract.status.value})'}, 400
+            )
+
         data = request.get_json()
-        
+
         # Execute contract with provided context
         execution_result = contract.execute(data)
-        
-        # Store payment history
+
+        # Keep the trigger indices and list cache in sync with the change
+        if contract.status != ContractStatus.ACTIVE:
+            deactivate(contract_id)
+        active_contracts.touch()
+
+        # Store payment history in one batch with a shared timestamp
         if 'payment_results' in execution_result:
-            for payment in execution_result['payment_results']:
-                payment_history.append({
+            executed_at = datetime.utcnow().isoformat()
+            _record_payments([
+                {
                     'contract_id': contract_id,
                     'payment': payment,
-                    'executed_at': datetime.utcnow().isoformat()
-                })
+                    'executed_at': executed_at
+                }
+                for payment in execution_result['payment_results']
+            ])
         
-        return jsonify({
+        return _json_response({
             'status': 'success',
             'execution_result': execution_result,
             'contract_status': contract.status.value
         })
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @contracts_bp.route('/contracts/auto-trigger', methods=['POST'])
 def auto_trigger_contracts():
@@ -109,52 +460,92 @@ def auto_trigger_contracts():
         risk_assessment_id = data.get('risk_assessment_id')
         
         if not risk_assessment_id:
-            return jsonify({'error': 'risk_assessment_id required'}), 400
+            return _json_response({'error': 'risk_assessment_id required'}, 400)
         
         # Get risk assessment
         risk_assessment = RiskAssessment.query.get(risk_assessment_id)
         if not risk_assessment:
-            return jsonify({'error': 'Risk assessment not found'}), 404
-        
-        # Find contracts that should be triggered
+            return _json_response({'error': 'Risk assessment not found'}, 404)
+        
+        # Prepare context for contract evaluation (shared by all candidates)
+        context = {
+            'risk_score': risk_assessment.risk_score,
+            'risk_type': risk_assessment.risk_type,
+            'location': {
+                'lat': risk_assessment.location_lat,
+                'lon': risk_assessment.location_lon
+            },
+            'confidence': risk_assessment.confidence,
+            'timestamp': risk_assessment.timestamp.isoformat()
+        }
+
+        # Only contracts indexed under this risk type (plus the catch-all
+        # bucket) whose vectorized threshold precheck passes need the full
+        # Python condition evaluation
+        # The buckets are mutated by _index_contract/deactivate from
+        # other request threads; candidates() rebuilds the threshold
+        # array lazily, so the lookup needs the same lock or a racing
+        # remove() can misalign the array against the contract list
+        with _state_lock:
+            typed_bucket = contracts_by_risk_type.get(risk_assessment.risk_type)
+            prechecked = (
+                (typed_bucket.candidates(risk_assessment.risk_score) if typed_bucket else [])
+                + contracts_any_risk.candidates(risk_assessment.risk_score)
+            )
+
+        # A contract mixing typed and untyped risk conditions sits in
+        # both buckets, so the concatenation can list it twice; each
+        # contract must execute at most once per trigger pass
+        seen_ids = set()
+        candidates = []
+        for contract in prechecked:
+            if contract.contract_id not in seen_ids:
+                seen_ids.add(contract.contract_id)
+                candidates.append(contract)
+
+        # Condition checks are cheap and stay serial; the executions
+        # (which hit simulated payment rails) are independent per
+        # contract, so they fan out across the pool and wall-clock time
+        # tracks the slowest contract instead of the sum
+        matches = [
+            contract for contract in candidates
+            if contract.status == ContractStatus.ACTIVE
+            and contract.evaluate_conditions(context)
+        ]
+        futures = [_execute_pool.submit(c.execute, context) for c in matches]
+
         triggered_contracts = []
-        
-        for contract_id, contract in active_contracts.items():
+
+        # Buffer history records and stamp the whole trigger pass once
+        executed_at = datetime.utcnow().isoformat()
+        new_records = []
+
+        for contract, future in zip(matches, futures):
+            execution_result = future.result(timeout=30)
+            triggered_contracts.append({
+                'contract_id': contract.contract_id,
+                'execution_result': execution_result
+            })
+
+            # Executed/failed contracts leave the trigger indices
             if contract.status != ContractStatus.ACTIVE:
-                continue
-            
-            # Prepare context for contract evaluation
-            context = {
-                'risk_score': risk_assessment.risk_score,
-                'risk_type': risk_assessment.risk_type,
-                'location': {
-                    'lat': risk_assessment.location_lat,
-                    'lon': risk_assessment.location_lon
-                },
-                'confidence': risk_assessment.confidence,
-                'timestamp': risk_assessment.timestamp.isoformat()
-            }
-            
-            # Check if contract conditions are met
-            if contract.evaluate_conditions(context):
-                execution_result = contract.execute(context)
-                triggered_contracts.append({
-                    'contract_id': contract_id,
-                    'execution_result': execution_result
+                deactivate(contract.contract_id)
+
+            # Store payment history
+            for payment in execution_result.get('payment_results', []):
+                new_records.append({
+                    'contract_id': contract.contract_id,
+                    'payment': payment,
+                    'executed_at': executed_at,
+                    'trigger_type': 'auto',
+                    'risk_assessment_id': risk_assessment_id
                 })
-                
-                # Store payment history
-                if 'payment_results' in execution_result:
-                    for payment in execution_result['payment_results']:
-                        payment_history.append({
-                            'contract_id': contract_id,
-                            'payment': payment,
-                            'executed_at': datetime.utcnow().isoformat(),
-                            'trigger_type': 'auto',
-                            'risk_assessment_id': risk_assessment_id
-                        })
+
+        _record_payments(new_records)
+        if triggered_contracts:
+            active_contracts.touch()
         
-        return jsonify({
+        return _json_response({
             'status': 'success',
             'risk_assessment': risk_assessment.to_dict(),
             'triggered_contracts': len(triggered_contracts),
@@ -166,46 +557,85 @@ def auto_trigger_contracts():
         })
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @contracts_bp.route('/contracts', methods=['GET'])
 def list_contracts():
     """List all contracts"""
     try:
         status_filter = request.args.get('status')
-        
-        contracts_list = []
-        for contract_id, contract in active_contracts.items():
-            if status_filter and contract.status.value != status_filter:
-                continue
-            
-            contracts_list.append(contract.to_dict())
-        
-        return jsonify({
-            'status': 'success',
-            'count': len(contracts_list),
-            'contracts': contracts_list
-        })
-    
+
+        # Resolve the filter to an enum member once; identity compares
+        # in the loop replace per-contract .value string compares, and a
+        # bad filter fails fast instead of returning an empty list
+        target_status = None
+        if status_filter:
+            try:
+                target_status = ContractStatus(status_filter)
+            except ValueError:
+                return _json_response(
+                    {'error': f'Invalid status filter: {status_filter}'}, 400
+                )
+
+        # Serialized bytes are reused until the store version moves
+        cache_key = (status_filter, active_contracts.version)
+        body = _list_cache.get(cache_key)
+
+        if body is None:
+            contracts_list = [
+                contract.to_dict_cached()
+                for contract_id, contract in active_contracts.items()
+                if target_status is None or contract.status is target_status
+            ]
+            body = orjson.dumps({
+                'status': 'success',
+                'count': len(contracts_list),
+                'contracts': contracts_list
+            })
+            # Entries from older store versions can never hit again;
+            # pop() tolerates two threads purging the same key
+            for stale_key in [k for k in _list_cache if k[1] != cache_key[1]]:
+                _list_cache.pop(stale_key, None)
+            _list_cache[cache_key] = body
+
+        return current_app.response_class(body, mimetype='application/json')
+
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @contracts_bp.route('/contracts/<contract_id>', methods=['GET'])
 def get_contract(contract_id):
     """Get a specific contract"""
     try:
-        if contract_id not in active_contracts:
-            return jsonify({'error': 'Contract not found'}), 404
-        
-        contract = active_contracts[contract_id]
+        contract = active_contracts.get(contract_id)
+        if contract is None:
+            return _json_response({'error': 'Contract not found'}, 404)
         
-        return jsonify({
+        return _json_response({
             'status': 'success',
-            'contract': contract.to_dict()
+            'contract': contract.to_dict_cached()
         })
-    
+
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
+
+@contracts_bp.route('/contracts/<contract_id>/verification', methods=['GET'])
+def get_contract_verification(contract_id):
+    """Poll the verification outcome of an async-created contract"""
+    try:
+        contract = active_contracts.get(contract_id)
+        if contract is None:
+            return _json_response({'error': 'Contract not found'}, 404)
+
+        return _json_response({
+            'status': 'success',
+            'contract_id': contract_id,
+            'contract_status': contract.status.value,
+            'verification': getattr(contract, 'verification_result', None)
+        })
+
+    except Exception as e:
+        return _json_response({'error': str(e)}, 500)
 
 @contracts_bp.route('/payments/aadhaar-bridge', methods=['POST'])
 def aadhaar_payment_bridge():
@@ -216,16 +646,16 @@ def aadhaar_payment_bridge():
         required_fields = ['beneficiary_aadhaar', 'amount', 'purpose']
         for field in required_fields:
             if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        # Simulate Aadhaar verification and payment
-        import random
-        
-        transaction_id = f"AADHAAR_{uuid.uuid4().hex[:8].upper()}"
-        success = random.random() > 0.05  # 95% success rate
+                return _json_response({'error': f'Missing required field: {field}'}, 400)
         
+        # Simulate Aadhaar verification and payment; one pool draw covers
+        # the success roll and both reference ids
+        rand = _draw(8)
+        transaction_id = f"AADHAAR_{rand[1:5].hex().upper()}"
+        success = rand[0] > 12  # 13/256 fail, ~95% success rate
+
         if success:
-            return jsonify({
+            return _json_response({
                 'status': 'success',
                 'transaction_id': transaction_id,
                 'beneficiary_aadhaar': data['beneficiary_aadhaar'][:4] + 'XXXX',  # Masked
@@ -233,18 +663,18 @@ def aadhaar_payment_bridge():
                 'currency': data.get('currency', 'INR'),
                 'purpose': data['purpose'],
                 'processed_at': datetime.utcnow().isoformat(),
-                'bank_reference': f"BANK_{uuid.uuid4().hex[:6].upper()}"
+                'bank_reference': f"BANK_{rand[5:8].hex().upper()}"
             })
         else:
-            return jsonify({
+            return _json_response({
                 'status': 'failed',
                 'error_code': 'AADHAAR_VERIFICATION_FAILED',
                 'message': 'Aadhaar verification failed',
                 'transaction_id': transaction_id
-            }), 400
+            }, 400)
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @contracts_bp.route('/payments/openg2p/program', methods=['POST'])
 def create_payment_program():
@@ -255,7 +685,7 @@ def create_payment_program():
         required_fields = ['program_name', 'budget']
         for field in required_fields:
             if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+                return _json_response({'error': f'Missing required field: {field}'}, 400)
         
         program = openg2p.create_payment_program(
             program_name=data['program_name'],
@@ -263,13 +693,13 @@ def create_payment_program():
             criteria=data.get('criteria', {})
         )
         
-        return jsonify({
+        return _json_response({
             'status': 'success',
             'program': program
-        }), 201
+        }, 201)
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @contracts_bp.route('/payments/openg2p/enroll', methods=['POST'])
 def enroll_beneficiary():
@@ -280,7 +710,7 @@ def enroll_beneficiary():
         required_fields = ['program_id', 'beneficiary_id']
         for field in required_fields:
             if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+                return _json_response({'error': f'Missing required field: {field}'}, 400)
         
         enrollment = openg2p.enroll_beneficiary(
             program_id=data['program_id'],
@@ -288,37 +718,37 @@ def enroll_beneficiary():
             eligibility_data=data.get('eligibility_data', {})
         )
         
-        return jsonify({
+        return _json_response({
             'status': 'success',
             'enrollment': enrollment
-        }), 201
+        }, 201)
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @contracts_bp.route('/payments/openg2p/bulk-payment', methods=['POST'])
 def process_bulk_payment():
     """Process bulk payments through OpenG2P"""
     try:
-        data = request.get_json()
+        data = _request_json()
         
         required_fields = ['program_id', 'payments']
         for field in required_fields:
             if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+                return _json_response({'error': f'Missing required field: {field}'}, 400)
         
         result = openg2p.process_bulk_payment(
             program_id=data['program_id'],
             payment_list=data['payments']
         )
         
-        return jsonify({
+        return _json_response({
             'status': 'success',
             'bulk_payment': result
         })
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @contracts_bp.route('/payments/history', methods=['GET'])
 def get_payment_history():
@@ -327,201 +757,159 @@ def get_payment_history():
         limit = request.args.get('limit', 50, type=int)
         contract_id = request.args.get('contract_id')
         
-        filtered_history = payment_history
-        
-        if contract_id:
-            filtered_history = [p for p in payment_history if p['contract_id'] == contract_id]
-        
-        # Sort by execution time (most recent first)
-        filtered_history.sort(key=lambda x: x['executed_at'], reverse=True)
-        
-        return jsonify({
+        offsets, total_count = payment_log.snapshot(contract_id)
+
+        # Appends are chronological, so most-recent-first is just reverse
+        # iteration over the offset index, reading only the frames needed
+        payments = [
+            payment_log.read(offset)
+            for offset in islice(reversed(offsets), limit)
+        ]
+
+        return _json_response({
             'status': 'success',
-            'count': len(filtered_history[:limit]),
-            'total_count': len(filtered_history),
-            'payments': filtered_history[:limit]
+            'count': len(payments),
+            'total_count': total_count,
+            'payments': payments
         })
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
+
+# Predefined contract templates; built once at import so the GET route
+# and template expansion never rebuild or re-parse them
+_TEMPLATES = {
+    'disaster_response': {
+        'name': 'Disaster Response Contract',
+        'description': 'Automatic payment trigger for disaster-affected beneficiaries',
+        'conditions': [
+            {
+                'condition_type': 'risk_threshold',
+                'parameters': {
+                    'threshold': 0.7,
+                    'risk_type': None  # Any risk type
+                },
+                'description': 'Trigger when risk score exceeds 0.7'
+            }
+        ],
+        'payment_instructions': [
+            {
+                'amount': 1000,
+                'currency': 'USD',
+                'payment_method': 'aadhaar_bridge',
+                'priority': 1,
+                'metadata': {
+                    'purpose': 'Emergency disaster relief',
+                    'category': 'immediate_assistance'
+                }
+            }
+        ]
+    },
+    'flood_specific': {
+        'name': 'Flood Response Contract',
+        'description': 'Specific contract for flood disasters',
+        'conditions': [
+            {
+                'condition_type': 'risk_threshold',
+                'parameters': {
+                    'threshold': 0.6,
+                    'risk_type': 'flood'
+                },
+                'description': 'Trigger when flood risk exceeds 0.6'
+            }
+        ],
+        'payment_instructions': [
+            {
+                'amount': 1500,
+                'currency': 'USD',
+                'payment_method': 'digital_wallet',
+                'priority': 1,
+                'metadata': {
+                    'purpose': 'Flood relief and evacuation',
+                    'category': 'flood_assistance'
+                }
+            }
+        ]
+    },
+    'earthquake_response': {
+        'name': 'Earthquake Response Contract',
+        'description': 'Emergency response for earthquake events',
+        'conditions': [
+            {
+                'condition_type': 'risk_threshold',
+                'parameters': {
+                    'threshold': 0.8,
+                    'risk_type': 'earthquake'
+                },
+                'description': 'Trigger when earthquake risk exceeds 0.8'
+            }
+        ],
+        'payment_instructions': [
+            {
+                'amount': 2000,
+                'currency': 'USD',
+                'payment_method': 'bank_transfer',
+                'priority': 1,
+                'metadata': {
+                    'purpose': 'Earthquake emergency relief',
+                    'category': 'structural_damage_assistance'
+                }
+            }
+        ]
+    }
+}
+
+# Templates never change at runtime, so the response body is encoded
+# once at import and served as raw bytes with an ETag for client caching
+_TEMPLATES_JSON = orjson.dumps({'status': 'success', 'templates': _TEMPLATES})
+_TEMPLATES_ETAG = hashlib.blake2b(_TEMPLATES_JSON, digest_size=8).hexdigest()
 
 @contracts_bp.route('/contracts/templates', methods=['GET'])
 def get_contract_templates():
     """Get predefined contract templates"""
-    try:
-        templates = {
-            'disaster_response': {
-                'name': 'Disaster Response Contract',
-                'description': 'Automatic payment trigger for disaster-affected beneficiaries',
-                'conditions': [
-                    {
-                        'condition_type': 'risk_threshold',
-                        'parameters': {
-                            'threshold': 0.7,
-                            'risk_type': None  # Any risk type
-                        },
-                        'description': 'Trigger when risk score exceeds 0.7'
-                    }
-                ],
-                'payment_instructions': [
-                    {
-                        'amount': 1000,
-                        'currency': 'USD',
-                        'payment_method': 'aadhaar_bridge',
-                        'priority': 1,
-                        'metadata': {
-                            'purpose': 'Emergency disaster relief',
-                            'category': 'immediate_assistance'
-                        }
-                    }
-                ]
-            },
-            'flood_specific': {
-                'name': 'Flood Response Contract',
-                'description': 'Specific contract for flood disasters',
-                'conditions': [
-                    {
-                        'condition_type': 'risk_threshold',
-                        'parameters': {
-                            'threshold': 0.6,
-                            'risk_type': 'flood'
-                        },
-                        'description': 'Trigger when flood risk exceeds 0.6'
-                    }
-                ],
-                'payment_instructions': [
-                    {
-                        'amount': 1500,
-                        'currency': 'USD',
-                        'payment_method': 'digital_wallet',
-                        'priority': 1,
-                        'metadata': {
-                            'purpose': 'Flood relief and evacuation',
-                            'category': 'flood_assistance'
-                        }
-                    }
-                ]
-            },
-            'earthquake_response': {
-                'name': 'Earthquake Response Contract',
-                'description': 'Emergency response for earthquake events',
-                'conditions': [
-                    {
-                        'condition_type': 'risk_threshold',
-                        'parameters': {
-                            'threshold': 0.8,
-                            'risk_type': 'earthquake'
-                        },
-                        'description': 'Trigger when earthquake risk exceeds 0.8'
-                    }
-                ],
-                'payment_instructions': [
-                    {
-                        'amount': 2000,
-                        'currency': 'USD',
-                        'payment_method': 'bank_transfer',
-                        'priority': 1,
-                        'metadata': {
-                            'purpose': 'Earthquake emergency relief',
-                            'category': 'structural_damage_assistance'
-                        }
-                    }
-                ]
-            }
-        }
-        
-        return jsonify({
-            'status': 'success',
-            'templates': templates
-        })
-    
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    if request.if_none_match.contains(_TEMPLATES_ETAG):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(
+            _TEMPLATES_JSON, mimetype='application/json'
+        )
+    response.set_etag(_TEMPLATES_ETAG)
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
 
 @contracts_bp.route('/contracts/create-from-template', methods=['POST'])
 def create_contract_from_template():
     """Create contract from template"""
     try:
-        data = request.get_json()
+        data = _request_json()
         template_name = data.get('template_name')
         beneficiaries = data.get('beneficiaries', [])
         
         if not template_name:
-            return jsonify({'error': 'template_name required'}), 400
-        
-        # Get templates
-        templates_response = get_contract_templates()
-        templates = templates_response[0].get_json()['templates']
+            return _json_response({'error': 'template_name required'}, 400)
         
-        if template_name not in templates:
-            return jsonify({'error': 'Template not found'}), 404
-        
-        template = templates[template_name]
+        template = _TEMPLATES.get(template_name)
+        if template is None:
+            return _json_response({'error': 'Template not found'}, 404)
         
         # Create contract from template
-        contract_data = {
-            'conditions': template['conditions'],
-            'payment_instructions': []
-        }
-        
-        # Create payment instructions for each beneficiary
-        for beneficiary_id in beneficiaries:
-            for payment_template in template['payment_instructions']:
-                payment_instruction = payment_template.copy()
-                payment_instruction['beneficiary_id'] = beneficiary_id
-                contract_data['payment_instructions'].append(payment_instruction)
-        
-        # Create the contract
-        return create_smart_contract_internal(contract_data)
+        contract_data = {'conditions': template['conditions']}
+
+        # Create payment instructions for each beneficiary. The merge
+        # shares the template's nested values instead of copying then
+        # overwriting; only beneficiary_id differs per instruction.
+        contract_data['payment_instructions'] = [
+            {**payment_template, 'beneficiary_id': beneficiary_id}
+            for beneficiary_id in beneficiaries
+            for payment_template in template['payment_instructions']
+        ]
+        
+        # Create the contract through the shared core
+        contract, verification_result = _create_contract_core(contract_data)
+        return _serialize_creation(contract, verification_result)
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
-def create_smart_contract_internal(data):
-    """Internal function to create smart contract"""
-    # Create new contract
-    contract = SmartContract()
-    
-    # Add conditions
-    conditions_data = data.get('conditions', [])
-    for condition_data in conditions_data:
-        condition = ContractCondition(
-            condition_type=condition_data['condition_type'],
-            parameters=condition_data['parameters'],
-            description=condition_data['description']
-        )
-        contract.add_condition(condition)
-    
-    # Add payment instructions
-    payments_data = data.get('payment_instructions', [])
-    for payment_data in payments_data:
-        instruction = PaymentInstruction(
-            beneficiary_id=payment_data['beneficiary_id'],
-            amount=payment_data['amount'],
-            currency=payment_data.get('currency', 'USD'),
-            payment_method=payment_data['payment_method'],
-            priority=payment_data.get('priority', 3),
-            metadata=payment_data.get('metadata', {})
-        )
-        contract.add_payment_instruction(instruction)
-    
-    # Verify contract through trust layer
-    verification_result = trust_layer.verify_contract(contract)
-    
-    if verification_result['verified']:
-        contract.status = ContractStatus.ACTIVE
-        active_contracts[contract.contract_id] = contract
-        
-        return jsonify({
-            'status': 'success',
-            'contract_id': contract.contract_id,
-            'verification': verification_result,
-            'contract': contract.to_dict()
-        }), 201
-    else:
-        return jsonify({
-            'status': 'failed',
-            'reason': 'Contract verification failed',
-            'verification': verification_result
-        }), 400
 
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Earth Sentinel pytest suite
+
+Pytest port of the checks in test_system.py, split into independent
+top-level tests so they can be distributed across workers with
+`pytest -n auto` (pytest-xdist). Like the runner script, it targets a
+live server at localhost:5000; the whole module skips if the API is
+unreachable. The steps of the integration workflow keep their ordering
+through chained fixtures.
+"""
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+API_BASE = 'http://localhost:5000/api'
+
+TEST_LOCATION = {"lat": -23.5505, "lon": -46.6333}
+
+
+@pytest.fixture(scope="session")
+def api():
+    """Shared pooled session; skips the suite if the server is down"""
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=20))
+    try:
+        session.get(f"{API_BASE}/health", timeout=2)
+    except requests.RequestException:
+        session.close()
+        pytest.skip("Earth Sentinel API is not reachable on localhost:5000")
+    yield session
+    session.close()
+
+
+def test_iot_sensors(api):
+    response = api.get(f"{API_BASE}/xroad/iot-sensors")
+    assert response.status_code == 200
+    data = response.json()
+    assert 'sensors' in data
+    assert len(data['sensors']) > 0
+
+
+def test_satellite_imagery(api):
+    response = api.get(f"{API_BASE}/xroad/satellite-imagery")
+    assert response.status_code == 200
+    data = response.json()
+    assert 'imagery' in data
+    assert data['image_count'] == len(data['imagery'])
+
+
+def test_weather_data(api):
+    response = api.get(f"{API_BASE}/xroad/weather-data")
+    assert response.status_code == 200
+    data = response.json()
+    assert 'weather_stations' in data
+    assert len(data['weather_stations']) > 0
+
+
+def test_risk_assessment(api):
+    response = api.post(f"{API_BASE}/risk/assess", json={"location": TEST_LOCATION})
+    assert response.status_code in (200, 201)
+    data = response.json()
+    assert 0.0 <= data['risk_score'] <= 1.0
+    assert 'risk_type' in data
+
+
+def test_federated_learning(api):
+    response = api.post(
+        f"{API_BASE}/risk/federated/simulate-training", json={"num_nodes": 3}
+    )
+    assert response.status_code in (200, 201)
+    data = response.json()
+    assert len(data['training_results']) == 3
+
+
+def test_contract_creation(api):
+    contract_data = {
+        "conditions": [
+            {
+                "condition_type": "risk_threshold",
+                "parameters": {"threshold": 0.8},
+                "description": "Test contract for high risk"
+            }
+        ],
+        "payment_instructions": [
+            {
+                "beneficiary_id": "TEST_001",
+                "amount": 500,
+                "currency": "USD",
+                "payment_method": "aadhaar_bridge",
+                "priority": 1,
+                "metadata": {"purpose": "Test payment"}
+            }
+        ]
+    }
+    response = api.post(f"{API_BASE}/contracts/create", json=contract_data)
+    # Verification consensus is randomized server-side; both outcomes
+    # must produce a well-formed response
+    if response.status_code in (200, 201):
+        assert 'contract_id' in response.json()
+    else:
+        assert response.status_code == 400
+        assert response.json()['status'] == 'failed'
+
+
+def test_aadhaar_payment(api):
+    payment_data = {
+        "beneficiary_aadhaar": "1234567890123456",
+        "amount": 750,
+        "currency": "USD",
+        "purpose": "Test emergency payment"
+    }
+    response = api.post(f"{API_BASE}/payments/aadhaar-bridge", json=payment_data)
+    # The bridge rolls a simulated failure for a few percent of
+    # payments; both outcomes must be well-formed
+    data = response.json()
+    if response.status_code == 200:
+        assert data['status'] == 'success'
+        assert data['transaction_id']
+    else:
+        assert response.status_code == 400
+        assert data['status'] == 'failed'
+
+
+def test_openg2p_program(api):
+    program_data = {
+        "program_name": "Test Emergency Relief Program",
+        "budget": 50000,
+        "criteria": {
+            "disaster_affected": True,
+            "income_threshold": 30000,
+            "vulnerability_score": 0.7
+        }
+    }
+    response = api.post(f"{API_BASE}/payments/openg2p/program", json=program_data)
+    assert response.status_code in (200, 201)
+    assert response.json()['program']['program_id']
+
+
+def test_resource_discovery(api):
+    discovery_data = {
+        "location": TEST_LOCATION,
+        "resource_type": "drone",
+        "requirements": {"capabilities": ["aerial_surveillance"]},
+        "max_distance_km": 25
+    }
+    response = api.post(f"{API_BASE}/dispatch/resources/discover", json=discovery_data)
+    assert response.status_code == 200
+    assert 'resources' in response.json()
+
+
+def test_emergency_simulation(api):
+    simulation_data = {
+        "emergency_type": "earthquake",
+        "location": dict(TEST_LOCATION, address="São Paulo Test Emergency")
+    }
+    response = api.post(f"{API_BASE}/dispatch/simulate-emergency", json=simulation_data)
+    assert response.status_code == 200
+    assert 'emergency_simulation' in response.json()
+
+
+@pytest.fixture(scope="session")
+def assessment_id(api):
+    """First integration step: a fresh risk assessment to chain from"""
+    response = api.post(f"{API_BASE}/risk/assess", json={"location": TEST_LOCATION})
+    assert response.status_code in (200, 201)
+    return response.json()['assessment_id']
+
+
+def test_integration_auto_trigger(api, assessment_id):
+    response = api.post(
+        f"{API_BASE}/contracts/auto-trigger",
+        json={"risk_assessment_id": assessment_id}
+    )
+    assert response.status_code == 200
+    assert response.json()['status'] == 'success'
+
+
+def test_integration_dispatch(api, assessment_id):
+    response = api.post(f"{API_BASE}/dispatch/simulate-emergency", json={
+        "emergency_type": "general",
+        "location": TEST_LOCATION
+    })
+    assert response.status_code == 200
@@ -4,67 +4,266 @@ Earth Sentinel System Test Suite
 Comprehensive testing of all system components and integrations
 """
 
+import asyncio
+import functools
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import logging
+import os
 import time
 import sys
 from datetime import datetime
 
+# Optional: ES_TEST_CACHE=1 serves repeated idempotent GETs from an
+# on-disk cache, making re-runs while iterating on this script
+# near-instant for the data-layer checks
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+# Optional fast JSON: report writing and response parsing use orjson
+# when present and fall back to the stdlib otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _parse(response):
+    """Decode a JSON response body"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 API_BASE = 'http://localhost:5000/api'
 
+# Progress lines go through logging rather than print: stderr is not
+# line-buffered against the TTY the same way, and under CI the queue
+# listener moves the actual I/O off the test threads entirely
+logger = logging.getLogger('es_tests')
+logger.setLevel(logging.INFO)
+if os.environ.get('CI'):
+    import atexit
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+    _log_queue = queue.Queue()
+    _listener = QueueListener(_log_queue, logging.StreamHandler())
+    _listener.start()
+    atexit.register(_listener.stop)
+    logger.addHandler(QueueHandler(_log_queue))
+else:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+
+# Full endpoint URLs composed once instead of via f-strings per call
+URLS = {
+    'bulk': f"{API_BASE}/xroad/bulk",
+    'risk_assess': f"{API_BASE}/risk/assess",
+    'federated_training': f"{API_BASE}/risk/federated/simulate-training",
+    'contract_create': f"{API_BASE}/contracts/create",
+    'auto_trigger': f"{API_BASE}/contracts/auto-trigger",
+    'resource_discover': f"{API_BASE}/dispatch/resources/discover",
+    'dispatch_request': f"{API_BASE}/dispatch/request",
+    'simulate_emergency': f"{API_BASE}/dispatch/simulate-emergency",
+}
+
+# Shared payload pieces, built once at import instead of per call
+# (requests serializes without mutating them, so reuse is safe)
+SP_LOCATION = {"lat": -23.5505, "lon": -46.6333}
+DRONE_REQUIREMENTS = {"capabilities": ["aerial_surveillance"]}
+TEST_CONTRACT = {
+    "conditions": [
+        {
+            "condition_type": "risk_threshold",
+            "parameters": {"threshold": 0.8},
+            "description": "Test contract for high risk"
+        }
+    ],
+    "payment_instructions": [
+        {
+            "beneficiary_id": "TEST_001",
+            "amount": 500,
+            "currency": "USD",
+            "payment_method": "aadhaar_bridge",
+            "priority": 1,
+            "metadata": {"purpose": "Test payment"}
+        }
+    ]
+}
+TEST_AADHAAR_PAYMENT = {
+    "beneficiary_aadhaar": "1234567890123456",
+    "amount": 750,
+    "currency": "USD",
+    "purpose": "Test emergency payment"
+}
+TEST_RELIEF_PROGRAM = {
+    "program_name": "Test Emergency Relief Program",
+    "budget": 50000,
+    "criteria": {
+        "disaster_affected": True,
+        "income_threshold": 30000,
+        "vulnerability_score": 0.7
+    }
+}
+
+def _report_path():
+    """Where to write the JSON report
+
+    ES_REPORT_PATH overrides the default (cwd); under pytest-xdist the
+    worker id is folded into the filename so parallel workers don't race
+    on one file.
+    """
+    path = os.environ.get('ES_REPORT_PATH', './test_report.json')
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+    if worker:
+        root, ext = os.path.splitext(path)
+        path = f"{root}_{worker}{ext}"
+    return path
+
+# HTTP/2 multiplexing (httpx with http2=True) was evaluated as an
+# alternative to pooled HTTP/1.1, but the backend serves over WSGI
+# (Werkzeug dev server or gunicorn), which only speaks HTTP/1.1 — h2
+# is never negotiated, cleartext h2c isn't supported there either, and
+# httpx would silently fall back. Revisit if the API moves behind an
+# h2-terminating proxy; until then keep-alive pooling below is the
+# whole available win.
+def _build_session():
+    """Plain pooled session, or a cached one when opted in and available"""
+    if os.environ.get('ES_TEST_CACHE') == '1' and requests_cache is not None:
+        session = requests_cache.CachedSession(
+            cache_name='es_test_cache', backend='sqlite', expire_after=300,
+            allowed_methods=['GET']  # POSTs mutate state, never cache them
+        )
+    else:
+        session = requests.Session()
+    # Transient failures (server warm-up resets, 5xx hiccups) retry with
+    # exponential backoff inside the pool instead of flaking the suite
+    retry = Retry(
+        total=5, backoff_factor=0.3,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=frozenset(['GET', 'POST'])
+    )
+    session.mount('http://', HTTPAdapter(
+        pool_connections=4, pool_maxsize=20, max_retries=retry
+    ))
+    return session
+
 class EarthSentinelTester:
     def __init__(self):
         self.test_results = []
         self.start_time = datetime.now()
+        # One pooled session for the whole suite: every call targets the
+        # same host, so keep-alive skips the TCP connect per request
+        self.session = _build_session()
+        # Fans out independent checks within a test group
+        self.pool = ThreadPoolExecutor(max_workers=8)
+        # Default timeouts in one place: a hung socket fails one check
+        # fast instead of stalling the whole suite
+        self._get = functools.partial(self.session.get, timeout=10)
+        self._post = functools.partial(self.session.post, timeout=30)
     
-    def log_test(self, test_name, success, message="", data=None):
-        """Log test result"""
+    def log_test(self, test_name, success, message="", data=None, ts=None):
+        """Log test result
+
+        Stores a float timestamp (time.time() is much cheaper than
+        datetime formatting); ISO rendering happens once in the report.
+        """
         status = "✓ PASS" if success else "✗ FAIL"
-        print(f"{status}: {test_name} - {message}")
+        logger.info(f"{status}: {test_name} - {message}")
         self.test_results.append({
             'test': test_name,
             'success': success,
             'message': message,
             'data': data,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': ts if ts is not None else time.time()
         })
     
-    def test_data_layer(self):
-        """Test X-Road data layer APIs"""
-        print("\n=== TESTING DATA LAYER ===")
-        
-        # Test IoT sensors
+    def _check(self, name, method, path, payload=None, validator=None):
+        """Run one endpoint check off the main thread
+
+        Returns (name, success, message) so results can be logged from
+        the submitting thread in completion order.
+        """
         try:
-            response = requests.get(f"{API_BASE}/xroad/iot-sensors")
-            data = response.json()
-            if response.status_code == 200 and 'sensors' in data:
-                self.log_test("IoT Sensors API", True, f"Retrieved {len(data['sensors'])} sensors")
+            if method == 'GET':
+                response = self._get(f"{API_BASE}{path}")
             else:
-                self.log_test("IoT Sensors API", False, f"Status: {response.status_code}")
-        except Exception as e:
-            self.log_test("IoT Sensors API", False, str(e))
-        
-        # Test satellite imagery
-        try:
-            response = requests.get(f"{API_BASE}/xroad/satellite-imagery")
-            data = response.json()
-            if response.status_code == 200 and 'images' in data:
-                self.log_test("Satellite Imagery API", True, f"Retrieved {len(data['images'])} images")
+                response = self._post(f"{API_BASE}{path}", json=payload)
+            data = _parse(response)
+            if validator:
+                result = (name,) + validator(response, data)
             else:
-                self.log_test("Satellite Imagery API", False, f"Status: {response.status_code}, Data: {data}")
+                result = (name, response.status_code == 200,
+                          f"Status: {response.status_code}")
+            if getattr(response, 'from_cache', False):
+                result = (result[0], result[1], f"{result[2]} (cached)")
+            return result
         except Exception as e:
-            self.log_test("Satellite Imagery API", False, str(e))
-        
-        # Test weather data
+            return name, False, str(e)
+
+    def _run_checks(self, checks):
+        """Fan independent checks out over the pool and log as they finish"""
+        futures = [self.pool.submit(self._check, *check) for check in checks]
+        for future in as_completed(futures):
+            self.log_test(*future.result())
+
+    @staticmethod
+    def _collection_validator(key, label):
+        """Validator for GETs that return a collection under a known key"""
+        def validate(response, data):
+            if response.status_code == 200 and key in data:
+                return True, f"Retrieved {len(data[key])} {label}"
+            return False, f"Status: {response.status_code}"
+        return validate
+
+    def _bulk_xroad(self):
+        """Fetch all three X-Road feeds in one round-trip, if supported
+
+        Returns True when the server offers /xroad/bulk and the combined
+        payload was validated; False means the caller should fall back
+        to the per-endpoint checks (older servers return 404 here).
+        """
         try:
-            response = requests.get(f"{API_BASE}/xroad/weather-data")
-            data = response.json()
-            if response.status_code == 200 and 'weather_stations' in data:
-                self.log_test("Weather Data API", True, f"Retrieved {len(data['weather_stations'])} stations")
-            else:
-                self.log_test("Weather Data API", False, f"Status: {response.status_code}")
-        except Exception as e:
-            self.log_test("Weather Data API", False, str(e))
+            response = self._get(URLS['bulk'])
+            # Servers without the route may 404 or serve the SPA
+            # catch-all, so insist on a JSON payload
+            if (response.status_code != 200
+                    or 'application/json' not in response.headers.get('Content-Type', '')):
+                return False
+            data = _parse(response)
+        except Exception:
+            return False
+        for name, section, validator in [
+            ("IoT Sensors API", 'iot',
+             self._collection_validator('sensors', 'sensors')),
+            ("Satellite Imagery API", 'satellite',
+             self._collection_validator('imagery', 'images')),
+            ("Weather Data API", 'weather',
+             self._collection_validator('weather_stations', 'stations')),
+        ]:
+            self.log_test(name, *validator(response, data.get(section, {})))
+        return True
+
+    def test_data_layer(self):
+        """Test X-Road data layer APIs"""
+        print("\n=== TESTING DATA LAYER ===")
+
+        # One bulk round-trip when the server supports it; otherwise the
+        # three independent feeds run concurrently
+        if self._bulk_xroad():
+            return
+        self._run_checks([
+            ("IoT Sensors API", 'GET', '/xroad/iot-sensors', None,
+             self._collection_validator('sensors', 'sensors')),
+            ("Satellite Imagery API", 'GET', '/xroad/satellite-imagery', None,
+             self._collection_validator('imagery', 'images')),
+            ("Weather Data API", 'GET', '/xroad/weather-data', None,
+             self._collection_validator('weather_stations', 'stations')),
+        ])
     
     def test_risk_modeling(self):
         """Test risk assessment and federated learning"""
@@ -72,11 +271,14 @@ class EarthSentinelTester:
         
         # Test risk assessment
         try:
-            payload = {"location": {"lat": -23.5505, "lon": -46.6333}}
-            response = requests.post(f"{API_BASE}/risk/assess", json=payload)
-            data = response.json()
+            payload = {"location": SP_LOCATION}
+            response = self._post(URLS['risk_assess'], json=payload)
+            data = _parse(response)
             if response.status_code in [200, 201] and 'risk_score' in data:
                 score = data['risk_score']
+                # Stash the id so the integration test can reuse this
+                # assessment instead of paying for a second inference
+                self.last_assessment_id = data.get('assessment_id')
                 self.log_test("Risk Assessment", True, f"Risk score: {score:.3f}, Type: {data.get('risk_type', 'unknown')}")
             else:
                 self.log_test("Risk Assessment", False, f"Status: {response.status_code}, Data: {data}")
@@ -86,8 +288,8 @@ class EarthSentinelTester:
         # Test federated learning simulation
         try:
             payload = {"num_nodes": 3}
-            response = requests.post(f"{API_BASE}/risk/federated/simulate-training", json=payload)
-            data = response.json()
+            response = self._post(URLS['federated_training'], json=payload)
+            data = _parse(response)
             if response.status_code in [200, 201] and 'training_results' in data:
                 self.log_test("Federated Learning", True, f"Trained on {len(data['training_results'])} nodes")
             else:
@@ -101,27 +303,8 @@ class EarthSentinelTester:
         
         # Create a test contract
         try:
-            contract_data = {
-                "conditions": [
-                    {
-                        "condition_type": "risk_threshold",
-                        "parameters": {"threshold": 0.8},
-                        "description": "Test contract for high risk"
-                    }
-                ],
-                "payment_instructions": [
-                    {
-                        "beneficiary_id": "TEST_001",
-                        "amount": 500,
-                        "currency": "USD",
-                        "payment_method": "aadhaar_bridge",
-                        "priority": 1,
-                        "metadata": {"purpose": "Test payment"}
-                    }
-                ]
-            }
-            response = requests.post(f"{API_BASE}/contracts/create", json=contract_data)
-            data = response.json()
+            response = self._post(URLS['contract_create'], json=TEST_CONTRACT)
+            data = _parse(response)
             if response.status_code in [200, 201] and 'contract_id' in data:
                 contract_id = data['contract_id']
                 self.log_test("Contract Creation", True, f"Created contract: {contract_id[:8]}...")
@@ -133,47 +316,30 @@ class EarthSentinelTester:
             self.log_test("Contract Creation", False, str(e))
             return None
     
+    @staticmethod
+    def _aadhaar_validator(response, data):
+        if response.status_code == 200 and data.get('status') == 'success':
+            return True, f"Transaction: {data.get('transaction_id', 'unknown')}"
+        return False, f"Status: {response.status_code}"
+
+    @staticmethod
+    def _openg2p_validator(response, data):
+        if response.status_code in [200, 201] and 'program' in data:
+            program_id = data['program']['program_id']
+            return True, f"Created program: {program_id[:8]}..."
+        return False, f"Status: {response.status_code}, Data: {data}"
+
     def test_payment_systems(self):
         """Test payment bridge systems"""
         print("\n=== TESTING PAYMENT SYSTEMS ===")
-        
-        # Test Aadhaar Payment Bridge
-        try:
-            payment_data = {
-                "beneficiary_aadhaar": "1234567890123456",
-                "amount": 750,
-                "currency": "USD",
-                "purpose": "Test emergency payment"
-            }
-            response = requests.post(f"{API_BASE}/payments/aadhaar-bridge", json=payment_data)
-            data = response.json()
-            if response.status_code == 200 and data.get('status') == 'success':
-                self.log_test("Aadhaar Payment", True, f"Transaction: {data.get('transaction_id', 'unknown')}")
-            else:
-                self.log_test("Aadhaar Payment", False, f"Status: {response.status_code}")
-        except Exception as e:
-            self.log_test("Aadhaar Payment", False, str(e))
-        
-        # Test OpenG2P program creation
-        try:
-            program_data = {
-                "program_name": "Test Emergency Relief Program",
-                "budget": 50000,
-                "criteria": {
-                    "disaster_affected": True,
-                    "income_threshold": 30000,
-                    "vulnerability_score": 0.7
-                }
-            }
-            response = requests.post(f"{API_BASE}/payments/openg2p/program", json=program_data)
-            data = response.json()
-            if response.status_code in [200, 201] and 'program' in data:
-                program_id = data['program']['program_id']
-                self.log_test("OpenG2P Program", True, f"Created program: {program_id[:8]}...")
-            else:
-                self.log_test("OpenG2P Program", False, f"Status: {response.status_code}, Data: {data}")
-        except Exception as e:
-            self.log_test("OpenG2P Program", False, str(e))
+
+        # The two payment rails don't interact; run them concurrently
+        self._run_checks([
+            ("Aadhaar Payment", 'POST', '/payments/aadhaar-bridge',
+             TEST_AADHAAR_PAYMENT, self._aadhaar_validator),
+            ("OpenG2P Program", 'POST', '/payments/openg2p/program',
+             TEST_RELIEF_PROGRAM, self._openg2p_validator),
+        ])
     
     def test_dispatch_system(self):
         """Test BeckN dispatch and fulfillment"""
@@ -182,13 +348,13 @@ class EarthSentinelTester:
         # Test resource discovery
         try:
             discovery_data = {
-                "location": {"lat": -23.5505, "lon": -46.6333},
+                "location": SP_LOCATION,
                 "resource_type": "drone",
-                "requirements": {"capabilities": ["aerial_surveillance"]},
+                "requirements": DRONE_REQUIREMENTS,
                 "max_distance_km": 25
             }
-            response = requests.post(f"{API_BASE}/dispatch/resources/discover", json=discovery_data)
-            data = response.json()
+            response = self._post(URLS['resource_discover'], json=discovery_data)
+            data = _parse(response)
             if response.status_code == 200 and 'resources' in data:
                 self.log_test("Resource Discovery", True, f"Found {len(data['resources'])} available drones")
             else:
@@ -200,18 +366,14 @@ class EarthSentinelTester:
         try:
             dispatch_data = {
                 "requester_id": "test_operator",
-                "location": {
-                    "lat": -23.5505,
-                    "lon": -46.6333,
-                    "address": "Test Emergency Location"
-                },
+                "location": dict(SP_LOCATION, address="Test Emergency Location"),
                 "resource_type": "drone",
                 "priority": 1,
-                "requirements": {"capabilities": ["aerial_surveillance"]},
+                "requirements": DRONE_REQUIREMENTS,
                 "description": "Test emergency dispatch"
             }
-            response = requests.post(f"{API_BASE}/dispatch/request", json=dispatch_data)
-            data = response.json()
+            response = self._post(URLS['dispatch_request'], json=dispatch_data)
+            data = _parse(response)
             if response.status_code == 201 and 'assignment' in data and data['assignment']:
                 assignment_id = data['assignment']['assignment_id']
                 self.log_test("Dispatch Request", True, f"Assignment: {assignment_id[:8]}...")
@@ -230,14 +392,10 @@ class EarthSentinelTester:
         try:
             simulation_data = {
                 "emergency_type": "earthquake",
-                "location": {
-                    "lat": -23.5505,
-                    "lon": -46.6333,
-                    "address": "São Paulo Test Emergency"
-                }
+                "location": dict(SP_LOCATION, address="São Paulo Test Emergency")
             }
-            response = requests.post(f"{API_BASE}/dispatch/simulate-emergency", json=simulation_data)
-            data = response.json()
+            response = self._post(URLS['simulate_emergency'], json=simulation_data)
+            data = _parse(response)
             if response.status_code == 200 and 'emergency_simulation' in data:
                 dispatched = data['emergency_simulation']['resources_dispatched']
                 self.log_test("Emergency Simulation", True, f"Dispatched {dispatched} resources")
@@ -251,20 +409,23 @@ class EarthSentinelTester:
         print("\n=== TESTING SYSTEM INTEGRATION ===")
         
         try:
-            # Step 1: Create risk assessment
-            risk_response = requests.post(f"{API_BASE}/risk/assess", json={
-                "location": {"lat": -23.5505, "lon": -46.6333}
-            })
-            
-            if risk_response.status_code not in [200, 201]:
-                self.log_test("Integration Test", False, f"Risk assessment failed: {risk_response.status_code}")
-                return
-            
-            risk_data = risk_response.json()
-            assessment_id = risk_data.get('assessment_id')
+            # Step 1: Reuse the assessment produced by the risk modeling
+            # group when it succeeded; otherwise create a fresh one
+            assessment_id = getattr(self, 'last_assessment_id', None)
+            if assessment_id is None:
+                risk_response = self._post(URLS['risk_assess'], json={
+                    "location": SP_LOCATION
+                })
+
+                if risk_response.status_code not in [200, 201]:
+                    self.log_test("Integration Test", False, f"Risk assessment failed: {risk_response.status_code}")
+                    return
+
+                risk_data = _parse(risk_response)
+                assessment_id = risk_data.get('assessment_id')
             
             # Step 2: Trigger contracts based on risk
-            trigger_response = requests.post(f"{API_BASE}/contracts/auto-trigger", json={
+            trigger_response = self._post(URLS['auto_trigger'], json={
                 "risk_assessment_id": assessment_id
             })
             
@@ -273,9 +434,9 @@ class EarthSentinelTester:
                 return
             
             # Step 3: Simulate emergency dispatch
-            dispatch_response = requests.post(f"{API_BASE}/dispatch/simulate-emergency", json={
+            dispatch_response = self._post(URLS['simulate_emergency'], json={
                 "emergency_type": "general",
-                "location": {"lat": -23.5505, "lon": -46.6333}
+                "location": SP_LOCATION
             })
             
             if dispatch_response.status_code == 200:
@@ -292,15 +453,19 @@ class EarthSentinelTester:
         print("EARTH SENTINEL TEST REPORT")
         print("="*60)
         
+        # Read the clock once for the whole report
+        end_time = datetime.now()
+        duration = end_time - self.start_time
+
         total_tests = len(self.test_results)
         passed_tests = sum(1 for result in self.test_results if result['success'])
         failed_tests = total_tests - passed_tests
-        
+
         print(f"Total Tests: {total_tests}")
         print(f"Passed: {passed_tests}")
         print(f"Failed: {failed_tests}")
         print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
-        print(f"Test Duration: {datetime.now() - self.start_time}")
+        print(f"Test Duration: {duration}")
         
         if failed_tests > 0:
             print("\nFAILED TESTS:")
@@ -310,21 +475,31 @@ class EarthSentinelTester:
         
         print("\n" + "="*60)
         
-        # Save detailed report
+        # Save detailed report; float timestamps from the hot logging
+        # path get their ISO rendering here, once
         report_data = {
             'summary': {
                 'total_tests': total_tests,
                 'passed': passed_tests,
                 'failed': failed_tests,
                 'success_rate': (passed_tests/total_tests)*100,
-                'duration': str(datetime.now() - self.start_time),
-                'timestamp': datetime.now().isoformat()
+                'duration': str(duration),
+                'timestamp': end_time.isoformat()
             },
-            'test_results': self.test_results
+            'test_results': [
+                dict(result,
+                     timestamp=datetime.fromtimestamp(result['timestamp']).isoformat())
+                for result in self.test_results
+            ]
         }
         
-        with open('/home/ubuntu/earth-sentinel/test_report.json', 'w') as f:
-            json.dump(report_data, f, indent=2)
+        report_path = _report_path()
+        if orjson is not None:
+            with open(report_path, 'wb') as f:
+                f.write(orjson.dumps(report_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(report_path, 'w') as f:
+                json.dump(report_data, f, indent=2)
         
         return passed_tests == total_tests
 
@@ -334,18 +509,44 @@ def main():
     print("Starting comprehensive system testing...")
     
     tester = EarthSentinelTester()
-    
-    # Run all test suites
-    tester.test_data_layer()
-    tester.test_risk_modeling()
-    tester.test_smart_contracts()
-    tester.test_payment_systems()
-    tester.test_dispatch_system()
-    tester.test_emergency_simulation()
-    tester.test_system_integration()
-    
-    # Generate final report
-    success = tester.generate_report()
+
+    if '--clear-cache' in sys.argv and hasattr(tester.session, 'cache'):
+        tester.session.cache.clear()
+
+    async def run_all():
+        # The first six groups are independent of each other, so they
+        # run concurrently (each on a worker thread, sharing the pooled
+        # session) and wall time tracks the slowest group, not the sum.
+        # Progress lines may interleave across groups, but each line
+        # stays whole.
+        await asyncio.gather(
+            asyncio.to_thread(tester.test_data_layer),
+            asyncio.to_thread(tester.test_risk_modeling),
+            asyncio.to_thread(tester.test_smart_contracts),
+            asyncio.to_thread(tester.test_payment_systems),
+            asyncio.to_thread(tester.test_dispatch_system),
+            asyncio.to_thread(tester.test_emergency_simulation),
+        )
+        # Integration chains its own steps (assessment -> trigger ->
+        # dispatch), so it runs after the groups settle
+        tester.test_system_integration()
+
+    try:
+        # One cheap preflight: if the server is down, bail out now
+        # instead of letting every check burn its own connect timeout
+        try:
+            tester.session.get(f"{API_BASE}/health", timeout=0.5)
+        except requests.RequestException:
+            print(f"API unreachable at {API_BASE} - is the server running?")
+            return 2
+
+        asyncio.run(run_all())
+
+        # Generate final report
+        success = tester.generate_report()
+    finally:
+        tester.pool.shutdown()
+        tester.session.close()
     
     return 0 if success else 1
 